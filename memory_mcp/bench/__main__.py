@@ -0,0 +1,3 @@
+from memory_mcp.bench.load import main
+
+main()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from memory_mcp.utils.cache import LRUCache
+
+
+class LegacyLRUCache:
+    def __init__(self, max_entries: int, ttl_s: int) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._store: dict[str, tuple[float, Any]] = {}
+
+    def get(self, key: str) -> Any | None:
+        if key not in self._store:
+            return None
+        timestamp, value = self._store[key]
+        if time.time() - timestamp > self.ttl_s:
+            self._store.pop(key, None)
+            return None
+        self._store.pop(key)
+        self._store[key] = (time.time(), value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if key in self._store:
+            self._store.pop(key)
+        elif len(self._store) >= self.max_entries:
+            oldest = next(iter(self._store))
+            self._store.pop(oldest, None)
+        self._store[key] = (time.time(), value)
+
+
+def _run(
+    factory: Callable[[], Any], entries: int, dim: int, lookups: int, seed: int
+) -> dict[str, float]:
+    rng = random.Random(seed)
+    keys = [f"text-{idx}" for idx in range(entries)]
+
+    tracemalloc.start()
+    cache = factory()
+    set_s = 0.0
+    for key in keys:
+        vector = [rng.random() for _ in range(dim)]
+        start = time.perf_counter()
+        cache.set(key, vector)
+        set_s += time.perf_counter() - start
+    del vector
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    probes = [rng.choice(keys) if rng.random() < 0.8 else "missing" for _ in range(lookups)]
+    start = time.perf_counter()
+    for key in probes:
+        cache.get(key)
+    get_s = time.perf_counter() - start
+    return {
+        "set_us": set_s / entries * 1e6,
+        "get_us": get_s / lookups * 1e6,
+        "resident_mb": current / (1024 * 1024),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LRUCache microbenchmark")
+    parser.add_argument("--entries", type=int, default=2048)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = {
+        "legacy": _run(
+            lambda: LegacyLRUCache(args.entries, 600), args.entries, args.dim, args.lookups, args.seed
+        ),
+        "lru": _run(
+            lambda: LRUCache(args.entries, 600), args.entries, args.dim, args.lookups, args.seed
+        ),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
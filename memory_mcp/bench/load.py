@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+import httpx
+from fastapi import FastAPI
+
+from memory_mcp.bench.stats import percentile
+from memory_mcp.config import settings
+from memory_mcp.db import SessionLocal, engine, replicas
+from memory_mcp.mcp_router import llm_client, router as mcp_router
+from memory_mcp.models import MemoryItem
+from memory_mcp.schemas import MemoryStatus, MemoryType
+from memory_mcp.utils.sql_stats import track_queries
+
+WORKLOADS = ("turn.ingest", "retrieve.context", "distill.extract", "audit.check_consistency")
+DEFAULT_MIX = "turn.ingest=4,retrieve.context=4,distill.extract=1,audit.check_consistency=1"
+
+_SUBJECTS = ["Postgres", "pgvector", "the retrieval API", "the job worker", "LibreChat", "the cache"]
+_VERBS = ["must stay", "should be", "was moved to", "depends on", "replaces", "is limited to"]
+_OBJECTS = [
+    "the primary datastore",
+    "HNSW indexes",
+    "a read replica",
+    "the ingest path",
+    "an HTTP/2 pool",
+    "a 30 second deadline",
+]
+_PREFIXES = ["", "", "Decision: ", "Constraint: ", "Open question: "]
+
+
+@dataclass
+class Dataset:
+    threads: list[UUID] = field(default_factory=list)
+    turns: dict[UUID, list[UUID]] = field(default_factory=dict)
+
+
+@dataclass
+class Sample:
+    tool: str
+    latency_s: float
+    sql_statements: int
+    status: int
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    weights: dict[str, float] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in WORKLOADS:
+            raise ValueError(f"Unknown workload {name}")
+        weights[name] = float(weight) if weight else 1.0
+    if not any(weight > 0 for weight in weights.values()):
+        raise ValueError("Workload mix needs at least one positive weight")
+    return weights
+
+
+def summarize(samples: list[Sample], elapsed_s: float) -> dict[str, Any]:
+    def describe(group: list[Sample]) -> dict[str, Any]:
+        latencies_ms = [sample.latency_s * 1000 for sample in group]
+        statements = [float(sample.sql_statements) for sample in group]
+        return {
+            "requests": len(group),
+            "errors": sum(1 for sample in group if sample.status != 200),
+            "status_codes": dict(Counter(str(sample.status) for sample in group)),
+            "throughput_rps": round(len(group) / elapsed_s, 3) if elapsed_s > 0 else 0.0,
+            "p50_ms": round(percentile(latencies_ms, 50), 3),
+            "p95_ms": round(percentile(latencies_ms, 95), 3),
+            "p99_ms": round(percentile(latencies_ms, 99), 3),
+            "max_ms": round(max(latencies_ms, default=0.0), 3),
+            "sql_statements_total": int(sum(statements)),
+            "sql_statements_mean": round(sum(statements) / len(group), 3) if group else 0.0,
+            "sql_statements_p95": percentile(statements, 95),
+        }
+
+    by_tool: dict[str, list[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_tool[sample.tool].append(sample)
+    return {
+        "elapsed_s": round(elapsed_s, 3),
+        "overall": describe(samples),
+        "tools": {tool: describe(group) for tool, group in sorted(by_tool.items())},
+    }
+
+
+def _sentence(rng: random.Random) -> str:
+    return (
+        f"{rng.choice(_PREFIXES)}{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} "
+        f"{rng.choice(_OBJECTS)} ({rng.randrange(10_000)})."
+    )
+
+
+async def _post(client: httpx.AsyncClient, tool: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    response = await client.post("/mcp", json={"tool": tool, "arguments": arguments})
+    response.raise_for_status()
+    return response.json()
+
+
+async def seed(
+    client: httpx.AsyncClient,
+    rng: random.Random,
+    plans: int,
+    threads_per_plan: int,
+    turns_per_thread: int,
+    items_per_thread: int,
+) -> Dataset:
+    dataset = Dataset()
+    run_id = uuid.uuid4().hex[:8]
+    for plan_index in range(plans):
+        plan = await _post(client, "plan.create", {"name": f"bench-{run_id}-{plan_index}", "meta": {}})
+        for _ in range(threads_per_plan):
+            thread = await _post(client, "thread.create", {"plan_id": plan["plan_id"], "meta": {}})
+            thread_id = UUID(thread["thread_id"])
+            dataset.threads.append(thread_id)
+            dataset.turns[thread_id] = [
+                UUID((await _post(client, "turn.ingest", _turn_arguments(thread_id, rng)))["turn_id"])
+                for _ in range(turns_per_thread)
+            ]
+            await _seed_items(thread_id, rng, items_per_thread)
+    return dataset
+
+
+async def _seed_items(thread_id: UUID, rng: random.Random, count: int) -> None:
+    if count <= 0:
+        return
+    statements = [_sentence(rng) for _ in range(count)]
+    embeddings = await llm_client.embed(statements)
+    async with SessionLocal() as session:
+        session.add_all(
+            MemoryItem(
+                thread_id=thread_id,
+                type=rng.choice(list(MemoryType)).value,
+                status=MemoryStatus.active.value,
+                title=statement[:60],
+                statement=statement,
+                importance=round(rng.random(), 3),
+                confidence=round(rng.random(), 3),
+                embedding=embedding,
+            )
+            for statement, embedding in zip(statements, embeddings)
+        )
+        await session.commit()
+
+
+def _turn_arguments(thread_id: UUID, rng: random.Random) -> dict[str, Any]:
+    return {
+        "thread_id": str(thread_id),
+        "role": rng.choice(["user", "assistant"]),
+        "text": _sentence(rng),
+        "embed_now": True,
+    }
+
+
+def _arguments(tool: str, dataset: Dataset, rng: random.Random, deep_ratio: float) -> dict[str, Any]:
+    thread_id = rng.choice(dataset.threads)
+    if tool == "turn.ingest":
+        return _turn_arguments(thread_id, rng)
+    if tool == "retrieve.context":
+        return {
+            "thread_id": str(thread_id),
+            "query": _sentence(rng),
+            "mode": "deep" if rng.random() < deep_ratio else "fast",
+            "scope": rng.choice(["distilled_only", "hybrid"]),
+        }
+    if tool == "distill.extract":
+        return {
+            "thread_id": str(thread_id),
+            "turn_id": str(rng.choice(dataset.turns[thread_id])),
+            "include_recent_turns": 4,
+            "write_to_memory": True,
+        }
+    return {"thread_id": str(thread_id), "proposed_plan_text": _sentence(rng), "deep": False}
+
+
+async def _call(client: httpx.AsyncClient, tool: str, arguments: dict[str, Any]) -> Sample:
+    with track_queries(tool) as stats:
+        started = time.perf_counter()
+        response = await client.post("/mcp", json={"tool": tool, "arguments": arguments})
+        latency_s = time.perf_counter() - started
+    return Sample(tool, latency_s, stats.statements, response.status_code)
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    dataset: Dataset,
+    rng: random.Random,
+    mix: dict[str, float],
+    requests: int,
+    concurrency: int,
+    deep_ratio: float,
+) -> list[Sample]:
+    schedule = iter(rng.choices(list(mix), weights=list(mix.values()), k=requests))
+    samples: list[Sample] = []
+
+    async def worker() -> None:
+        for tool in schedule:
+            samples.append(await _call(client, tool, _arguments(tool, dataset, rng, deep_ratio)))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    settings.fake_llm = True
+    settings.fake_llm_latency_ms = 0.0
+    settings.fake_llm_latency_jitter_ms = 0.0
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    app = FastAPI()
+    app.include_router(mcp_router, prefix="/mcp")
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            started = time.perf_counter()
+            dataset = await seed(
+                client, rng, args.plans, args.threads, args.turns, args.items
+            )
+            seed_s = time.perf_counter() - started
+
+            settings.fake_llm_latency_ms = args.llm_latency_ms
+            settings.fake_llm_latency_jitter_ms = args.llm_jitter_ms
+            await drive(client, dataset, rng, mix, args.warmup, args.concurrency, args.deep_ratio)
+            started = time.perf_counter()
+            samples = await drive(
+                client, dataset, rng, mix, args.requests, args.concurrency, args.deep_ratio
+            )
+            elapsed_s = time.perf_counter() - started
+    finally:
+        await llm_client.close()
+        await replicas.dispose()
+        await engine.dispose()
+    return {
+        "config": vars(args),
+        "seed": {
+            "threads": len(dataset.threads),
+            "turns": sum(len(turns) for turns in dataset.turns.values()),
+            "memory_items": len(dataset.threads) * args.items,
+            "seconds": round(seed_s, 3),
+        },
+        "results": summarize(samples, elapsed_s),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m memory_mcp.bench", description="Synthetic /mcp load benchmark with the fake LLM"
+    )
+    parser.add_argument("--plans", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=5, help="threads per plan")
+    parser.add_argument("--turns", type=int, default=20, help="turns per thread")
+    parser.add_argument("--items", type=int, default=50, help="memory items per thread")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--deep-ratio", type=float, default=0.2)
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=25.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="also write the JSON report to this path")
+    args = parser.parse_args()
+    if min(args.plans, args.threads, args.turns, args.concurrency) < 1:
+        parser.error("--plans, --threads, --turns and --concurrency must be at least 1")
+
+    report = asyncio.run(run(args))
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(rendered)
+    print(rendered)
+
+
+if __name__ == "__main__":
+    main()
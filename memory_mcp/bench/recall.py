@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from memory_mcp.bench.stats import percentile
+from memory_mcp.config import settings
+from memory_mcp.db import engine
+from memory_mcp.services.vector_index import QUANTIZATIONS, index_target
+
+CORPUS_TABLE = "recall_corpus"
+INDEX_NAME = "recall_corpus_embedding_idx"
+_INSERT_BATCH = 500
+
+
+@dataclass
+class SweepRow:
+    index: str
+    build: str
+    search: str
+    recall: float
+    p50_ms: float
+    p95_ms: float
+    build_s: float
+    size_mb: float
+
+
+def int_list(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def recall_at_k(found: list[int], truth: list[int]) -> float:
+    if not truth:
+        return 1.0
+    return len(set(found) & set(truth)) / len(truth)
+
+
+def format_table(rows: list[SweepRow], k: int) -> str:
+    headers = ["index", "build", "search", f"recall@{k}", "p50_ms", "p95_ms", "build_s", "size_mb"]
+    cells = [
+        [
+            row.index,
+            row.build,
+            row.search,
+            f"{row.recall:.4f}",
+            f"{row.p50_ms:.3f}",
+            f"{row.p95_ms:.3f}",
+            f"{row.build_s:.2f}",
+            f"{row.size_mb:.1f}",
+        ]
+        for row in rows
+    ]
+    widths = [max(len(line[col]) for line in [headers, *cells]) for col in range(len(headers))]
+    lines = [
+        "  ".join(value.ljust(width) for value, width in zip(line, widths))
+        for line in [headers, *cells]
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def _literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{value:.6f}" for value in vector) + "]"
+
+
+def synthetic_corpus(count: int, dim: int, clusters: int, spread: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=count)
+    return centers[labels] + spread * rng.standard_normal((count, dim)).astype(np.float32)
+
+
+def perturb(vectors: np.ndarray, noise: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed + 1)
+    scale = np.sqrt(np.mean(vectors**2, axis=1, keepdims=True))
+    return vectors + noise * scale * rng.standard_normal(vectors.shape).astype(np.float32)
+
+
+async def _create_corpus(conn: AsyncConnection, dim: int) -> None:
+    await conn.execute(text(f"DROP TABLE IF EXISTS {CORPUS_TABLE}"))
+    await conn.execute(
+        text(f"CREATE TEMP TABLE {CORPUS_TABLE} (id integer PRIMARY KEY, embedding vector({dim}))")
+    )
+
+
+async def _load_vectors(conn: AsyncConnection, vectors: np.ndarray) -> None:
+    statement = text(
+        f"INSERT INTO {CORPUS_TABLE} (id, embedding) VALUES (:id, CAST(:embedding AS vector))"
+    )
+    for start in range(0, len(vectors), _INSERT_BATCH):
+        batch = vectors[start : start + _INSERT_BATCH]
+        await conn.execute(
+            statement,
+            [{"id": start + offset, "embedding": _literal(row)} for offset, row in enumerate(batch)],
+        )
+
+
+async def _copy_table(conn: AsyncConnection, source: str, count: int) -> None:
+    await conn.execute(
+        text(
+            f"INSERT INTO {CORPUS_TABLE} (id, embedding) "
+            f"SELECT row_number() OVER (), embedding FROM {source} "
+            "WHERE embedding IS NOT NULL LIMIT :count"
+        ),
+        {"count": count},
+    )
+
+
+async def _sample_queries(conn: AsyncConnection, count: int, seed: int) -> np.ndarray:
+    await conn.execute(text("SELECT setseed(:seed)"), {"seed": (seed % 1000) / 1000})
+    rows = await conn.execute(
+        text(f"SELECT embedding::text FROM {CORPUS_TABLE} ORDER BY random() LIMIT :count"),
+        {"count": count},
+    )
+    return np.array([json.loads(row[0]) for row in rows], dtype=np.float32)
+
+
+def search_sql(quantization: str, dim: int, rerank_factor: int) -> str:
+    exact_order = f"SELECT id FROM {CORPUS_TABLE} {{where}}ORDER BY embedding <=> CAST(:query AS vector) LIMIT :k"
+    if quantization == "none":
+        return exact_order.format(where="")
+    if quantization == "halfvec":
+        candidate_order = f"embedding::halfvec({dim}) <=> CAST(:query AS halfvec({dim}))"
+    else:
+        candidate_order = (
+            f"binary_quantize(embedding)::bit({dim}) <~> "
+            f"binary_quantize(CAST(:query AS vector({dim})))::bit({dim})"
+        )
+    candidates = (
+        f"SELECT id FROM {CORPUS_TABLE} ORDER BY {candidate_order} LIMIT {int(rerank_factor)} * :k"
+    )
+    return exact_order.format(where=f"WHERE id IN ({candidates}) ")
+
+
+async def _search(
+    conn: AsyncConnection, queries: list[str], k: int, sql: str
+) -> tuple[list[list[int]], list[float]]:
+    statement = text(sql)
+    results: list[list[int]] = []
+    latencies_ms: list[float] = []
+    for query in queries:
+        started = time.perf_counter()
+        rows = await conn.execute(statement, {"query": query, "k": k})
+        results.append([row[0] for row in rows])
+        latencies_ms.append((time.perf_counter() - started) * 1000)
+    return results, latencies_ms
+
+
+def _row(
+    index: str,
+    build: str,
+    search: str,
+    results: list[list[int]],
+    truth: list[list[int]],
+    latencies_ms: list[float],
+    build_s: float,
+    size_mb: float,
+) -> SweepRow:
+    recall = sum(recall_at_k(found, exact) for found, exact in zip(results, truth)) / len(truth)
+    return SweepRow(
+        index=index,
+        build=build,
+        search=search,
+        recall=recall,
+        p50_ms=percentile(latencies_ms, 50),
+        p95_ms=percentile(latencies_ms, 95),
+        build_s=build_s,
+        size_mb=size_mb,
+    )
+
+
+async def _build_index(
+    conn: AsyncConnection, method: str, target: str, options: str
+) -> tuple[float, float]:
+    started = time.perf_counter()
+    await conn.execute(
+        text(f"CREATE INDEX {INDEX_NAME} ON {CORPUS_TABLE} USING {method} {target} WITH ({options})")
+    )
+    build_s = time.perf_counter() - started
+    await conn.execute(text(f"ANALYZE {CORPUS_TABLE}"))
+    size = (await conn.execute(text(f"SELECT pg_relation_size('{INDEX_NAME}')"))).scalar_one()
+    return build_s, size / (1024 * 1024)
+
+
+async def sweep(args: argparse.Namespace) -> dict[str, Any]:
+    rows: list[SweepRow] = []
+    async with engine.connect() as conn:
+        dim = args.dim
+        await _create_corpus(conn, dim)
+        if args.source == "synthetic":
+            corpus = synthetic_corpus(args.count, dim, args.clusters, args.spread, args.seed)
+            await _load_vectors(conn, corpus)
+        else:
+            await _copy_table(conn, args.source, args.count)
+        corpus_size = (await conn.execute(text(f"SELECT count(*) FROM {CORPUS_TABLE}"))).scalar_one()
+        if corpus_size < args.k:
+            raise SystemExit(f"Corpus has {corpus_size} vectors, fewer than k={args.k}")
+        await conn.execute(text(f"ANALYZE {CORPUS_TABLE}"))
+
+        sampled = await _sample_queries(conn, args.queries, args.seed)
+        queries = [_literal(vector) for vector in perturb(sampled, args.noise, args.seed)]
+        truth, exact_ms = await _search(conn, queries, args.k, search_sql("none", dim, 1))
+        rows.append(_row("exact", "-", "seq scan", truth, truth, exact_ms, 0.0, 0.0))
+        await conn.execute(text("SET enable_seqscan = off"))
+
+        builds: list[tuple[str, str, str, str, list[int]]] = []
+        if "hnsw" in args.index:
+            builds += [
+                (
+                    "hnsw",
+                    f"m={m} ef_construction={ef_construction}",
+                    f"m = {m}, ef_construction = {ef_construction}",
+                    "hnsw.ef_search",
+                    args.ef_search,
+                )
+                for m in args.hnsw_m
+                for ef_construction in args.hnsw_ef_construction
+            ]
+        if "ivfflat" in args.index:
+            builds += [
+                (
+                    "ivfflat",
+                    f"lists={lists}",
+                    f"lists = {lists}",
+                    "ivfflat.probes",
+                    [probes for probes in args.probes if probes <= lists],
+                )
+                for lists in args.ivfflat_lists
+            ]
+
+        for quantization in args.quantization:
+            sql = search_sql(quantization, dim, args.rerank_factor)
+            label_suffix = "" if quantization == "none" else f"+{quantization}"
+            search_suffix = "" if quantization == "none" else f" rerank={args.rerank_factor}x"
+            for method, build, options, parameter, values in builds:
+                build_s, size_mb = await _build_index(
+                    conn, method, index_target(quantization, dim), options
+                )
+                for value in values:
+                    await conn.execute(text(f"SET {parameter} = {value}"))
+                    results, latencies_ms = await _search(conn, queries, args.k, sql)
+                    rows.append(
+                        _row(
+                            f"{method}{label_suffix}",
+                            build,
+                            f"{parameter.split('.')[1]}={value}{search_suffix}",
+                            results,
+                            truth,
+                            latencies_ms,
+                            build_s,
+                            size_mb,
+                        )
+                    )
+                await conn.execute(text(f"DROP INDEX {INDEX_NAME}"))
+
+        # Temp table, indexes and SET values all roll back with the transaction.
+        await conn.rollback()
+    await engine.dispose()
+    return {"corpus": corpus_size, "queries": len(queries), "k": args.k, "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vector index recall@k vs latency sweep")
+    parser.add_argument(
+        "--source",
+        default="synthetic",
+        choices=["synthetic", "memory_items", "turns"],
+        help="generate vectors or copy embeddings from an existing table",
+    )
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=settings.embedding_dim)
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--spread", type=float, default=0.5)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--noise", type=float, default=0.1)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--index", type=lambda value: value.split(","), default=["hnsw", "ivfflat"])
+    parser.add_argument("--hnsw-m", type=int_list, default=[settings.vector_hnsw_m])
+    parser.add_argument(
+        "--hnsw-ef-construction", type=int_list, default=[settings.vector_hnsw_ef_construction]
+    )
+    parser.add_argument("--ef-search", type=int_list, default=[10, 20, 40, 80, 160])
+    parser.add_argument("--ivfflat-lists", type=int_list, default=[settings.vector_ivfflat_lists])
+    parser.add_argument("--probes", type=int_list, default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument(
+        "--quantization",
+        type=lambda value: value.split(","),
+        default=["none"],
+        help=f"comma separated subset of {','.join(QUANTIZATIONS)}",
+    )
+    parser.add_argument("--rerank-factor", type=int, default=settings.vector_rerank_factor)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print the raw rows as JSON")
+    args = parser.parse_args()
+    unknown = set(args.quantization) - set(QUANTIZATIONS)
+    if unknown:
+        parser.error(f"Unknown quantization {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(sweep(args))
+    if args.json:
+        report["rows"] = [asdict(row) for row in report["rows"]]
+        print(json.dumps(report, indent=2))
+        return
+    print(f"corpus={report['corpus']} queries={report['queries']} k={report['k']}")
+    print(format_table(report["rows"], report["k"]))
+
+
+if __name__ == "__main__":
+    main()
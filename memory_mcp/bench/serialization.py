@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from memory_mcp.schemas import (
+    DistillItem,
+    DistillResult,
+    RetrieveContextResponse,
+    RetrieveDecisionStateResponse,
+    SharedExportResponse,
+)
+from memory_mcp.utils.serialization import dumps
+
+
+def _retrieve_context(chunks: int) -> dict[str, Any]:
+    return {
+        "chunks": [
+            {
+                "source": "memory" if idx % 2 else "turn",
+                "item_id": str(uuid.uuid4()),
+                "text": "Postgres is the primary datastore for memory items. " * 4,
+                "score": 0.0163 - idx * 0.0001,
+                "score_detail": {"rrf_score": 0.0163, "ranks": [idx + 1, None, 3, None]},
+            }
+            for idx in range(chunks)
+        ],
+        "est_tokens": chunks * 50,
+        "low_confidence": False,
+        "debug_scores": {"count": chunks, "total_candidates": chunks * 2},
+        "stale_references": ["Plan references superseded item 'Old storage'."],
+    }
+
+
+def _decision_state(items: int) -> dict[str, Any]:
+    def entries() -> list[dict[str, Any]]:
+        return [
+            {
+                "id": uuid.uuid4(),
+                "title": f"Decision {idx}",
+                "statement": "Use pgvector HNSW indexes for memory embeddings.",
+                "importance": 0.8,
+                "confidence": 0.7,
+            }
+            for idx in range(items)
+        ]
+
+    return {
+        "decisions": entries(),
+        "constraints": entries(),
+        "avoid_list_mistakes": entries(),
+        "assumptions": entries(),
+        "open_questions": entries(),
+    }
+
+
+def _shared_export(items: int) -> dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "package_id": uuid.uuid4(),
+        "payload": {
+            "thread_id": str(uuid.uuid4()),
+            "items": [
+                {
+                    "type": "decision",
+                    "title": f"Decision {idx}",
+                    "statement": "Retrieval runs hybrid search with RRF fusion.",
+                    "importance": 0.6,
+                    "confidence": 0.6,
+                    "severity": 0.0,
+                    "tags": ["retrieval", "performance"],
+                    "affects": ["core"],
+                    "code_refs": ["memory_mcp/services/retrieval.py"],
+                    "evidence_turn_ids": [uuid.uuid4(), uuid.uuid4()],
+                }
+                for idx in range(items)
+            ],
+            "created_at": now.isoformat(),
+            "expires_at": now.isoformat(),
+        },
+        "signature": "0" * 64,
+    }
+
+
+def _distill_extract(items: int) -> dict[str, Any]:
+    item = DistillItem(title="Use Postgres", statement="Postgres is primary.", importance=0.8, confidence=0.7)
+    return {
+        "inserted": items,
+        "deduped": 0,
+        "superseded": 0,
+        "extracted": DistillResult(decisions=[item] * items, constraints=[item] * items),
+    }
+
+
+RESPONSE_MODELS = {
+    "retrieve.context": TypeAdapter(RetrieveContextResponse),
+    "retrieve.decision_state": TypeAdapter(RetrieveDecisionStateResponse),
+    "shared.export": TypeAdapter(SharedExportResponse),
+}
+
+
+def _response_model(adapter: TypeAdapter) -> Callable[[Any], bytes]:
+    # What a typed response_model costs: validate the handler dict, then dump with the
+    # schema's precompiled pydantic-core serializer.
+    return lambda payload: adapter.dump_json(adapter.validate_python(payload))
+
+
+def _legacy(payload: Any) -> bytes:
+    return json.dumps(jsonable_encoder(payload)).encode("utf-8")
+
+
+def _measure(encode: Callable[[Any], bytes], payload: Any, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encode(payload)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tool response serialization benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        "retrieve.context": _retrieve_context(args.size),
+        "retrieve.decision_state": _decision_state(args.size),
+        "shared.export": _shared_export(args.size * 10),
+        "distill.extract": _distill_extract(args.size),
+    }
+    results = {}
+    for tool_name, payload in payloads.items():
+        assert json.loads(dumps(payload)) == json.loads(_legacy(payload))
+        legacy_us = _measure(_legacy, payload, args.iterations)
+        orjson_us = _measure(dumps, payload, args.iterations)
+        results[tool_name] = {
+            "jsonable_encoder_us": legacy_us,
+            "orjson_us": orjson_us,
+            "speedup": legacy_us / orjson_us,
+        }
+        adapter = RESPONSE_MODELS.get(tool_name)
+        if adapter is not None:
+            typed = _response_model(adapter)
+            assert json.loads(typed(payload)) == json.loads(dumps(payload))
+            results[tool_name]["response_model_us"] = _measure(typed, payload, args.iterations)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
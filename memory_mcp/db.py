@@ -1,19 +1,182 @@
 from __future__ import annotations
 
+import asyncio
+import itertools
+import logging
+import math
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DisconnectionError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from memory_mcp.config import settings
+from memory_mcp.metrics import db_pool_connections, db_pool_wait, db_replica_lag
+from memory_mcp.utils.deadline import DeadlineExceeded, remaining
+from memory_mcp.utils.sql_stats import instrument_engine
+
+logger = logging.getLogger(__name__)
 
-engine: AsyncEngine = create_async_engine(
-    settings.database_url,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
 )
 
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait.labels(engine=self.logging_name).observe(time.perf_counter() - started)
+
+
+def _observe_pool(pool: InstrumentedQueuePool) -> None:
+    checked_out = pool.checkedout()
+    db_pool_connections.labels(engine=pool.logging_name, state="checked_out").set(checked_out)
+    db_pool_connections.labels(engine=pool.logging_name, state="idle").set(pool.checkedin())
+    db_pool_connections.labels(engine=pool.logging_name, state="overflow").set(
+        max(0, pool.overflow())
+    )
+
+
+def _ping_if_idle(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+    checked_in_at = record.info.get("checked_in_at")
+    if checked_in_at is None or time.monotonic() - checked_in_at < settings.db_pool_ping_idle_s:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    except Exception as error:
+        raise DisconnectionError() from error
+    finally:
+        cursor.close()
+
+
+def _connect_args() -> dict[str, Any]:
+    if settings.db_pgbouncer:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    }
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    if settings.db_pool_ping not in ("always", "idle", "never"):
+        raise ValueError(f"Unknown DB_POOL_PING {settings.db_pool_ping}")
+    if settings.db_pool_size <= 0:
+        created = create_async_engine(url, poolclass=NullPool, connect_args=_connect_args())
+        instrument_engine(created.sync_engine)
+        return created
+    created = create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_s,
+        pool_recycle=settings.db_pool_recycle_s,
+        pool_pre_ping=settings.db_pool_ping == "always",
+        connect_args=_connect_args(),
+    )
+    pool_events = created.sync_engine.pool
+
+    @event.listens_for(pool_events, "checkout")
+    def _on_checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+        if settings.db_pool_ping == "idle":
+            _ping_if_idle(dbapi_connection, record, proxy)
+        _observe_pool(created.sync_engine.pool)
+
+    @event.listens_for(pool_events, "checkin")
+    def _on_checkin(dbapi_connection: Any, record: Any) -> None:
+        record.info["checked_in_at"] = time.monotonic()
+        _observe_pool(created.sync_engine.pool)
+
+    instrument_engine(created.sync_engine)
+    return created
+
+
+engine: AsyncEngine = _create_engine(settings.database_url, "primary")
+
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
+class ReplicaSet:
+    def __init__(self, urls: list[str], strategy: str, max_lag_s: float) -> None:
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown DATABASE_REPLICA_STRATEGY {strategy}")
+        self.strategy = strategy
+        self.max_lag_s = max_lag_s
+        self.engines = [
+            _create_engine(url, f"replica-{index}") for index, url in enumerate(urls)
+        ]
+        self.lag_s = [math.inf for _ in self.engines]
+        self._sessionmakers = [
+            async_sessionmaker(replica, expire_on_commit=False, class_=AsyncSession)
+            for replica in self.engines
+        ]
+        self._counter = itertools.count()
+
+    def healthy(self) -> list[int]:
+        return [index for index, lag in enumerate(self.lag_s) if lag <= self.max_lag_s]
+
+    def pick(self) -> int | None:
+        candidates = self.healthy()
+        if not candidates:
+            return None
+        if self.strategy == "least_connections":
+            return min(candidates, key=lambda index: self.engines[index].pool.checkedout())
+        return candidates[next(self._counter) % len(candidates)]
+
+    def session(self) -> AsyncSession:
+        index = self.pick()
+        if index is None:
+            return SessionLocal()
+        return self._sessionmakers[index]()
+
+    async def refresh_lag(self) -> None:
+        for index, replica in enumerate(self.engines):
+            try:
+                async with replica.connect() as conn:
+                    lag = float((await conn.execute(REPLICA_LAG_SQL)).scalar_one())
+            except Exception:
+                logger.warning("Replica %s lag check failed", index, exc_info=True)
+                lag = math.inf
+            self.lag_s[index] = lag
+            db_replica_lag.labels(replica=str(index)).set(lag)
+
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+
+
+replicas = ReplicaSet(
+    settings.database_replica_urls,
+    settings.database_replica_strategy,
+    settings.database_replica_max_lag_s,
+)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session: Session, transaction, connection) -> None:
+    budget = remaining()
+    if budget is None:
+        return
+    if budget <= 0:
+        raise DeadlineExceeded("Deadline exceeded before database transaction")
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(budget * 1000))}")
+
+
 async def get_session() -> AsyncSession:
     async with SessionLocal() as session:
         yield session
@@ -21,3 +184,13 @@ async def get_session() -> AsyncSession:
 
 def session_factory() -> AsyncSession:
     return SessionLocal()
+
+
+def read_session_factory() -> AsyncSession:
+    return replicas.session()
+
+
+async def monitor_replica_lag(stop_event: asyncio.Event) -> None:
+    while not stop_event.is_set():
+        await replicas.refresh_lag()
+        await asyncio.sleep(settings.database_replica_lag_check_interval_s)
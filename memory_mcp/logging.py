@@ -2,14 +2,15 @@ from __future__ import annotations
 
 import logging
 import sys
-import uuid
 from pythonjsonlogger import jsonlogger
 
+from memory_mcp.utils.request_context import current_request_id
+
 
 class RequestIdFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
         if not hasattr(record, "request_id"):
-            record.request_id = str(uuid.uuid4())
+            record.request_id = current_request_id.get()
         return True
 
 
@@ -19,6 +20,7 @@ def configure_logging(level: str) -> None:
         "%(asctime)s %(levelname)s %(name)s %(message)s %(request_id)s"
     )
     handler.setFormatter(formatter)
+    handler.addFilter(RequestIdFilter())
 
     root = logging.getLogger()
     root.setLevel(level)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 
 from fastapi import FastAPI
 from sqlalchemy import text
@@ -8,9 +9,11 @@ from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from starlette.responses import Response
 
 from memory_mcp.config import settings
-from memory_mcp.db import engine, session_factory
+from memory_mcp.db import engine, monitor_replica_lag, replicas, session_factory
 from memory_mcp.logging import configure_logging
 from memory_mcp.mcp_router import router as mcp_router, llm_client
+from memory_mcp.mcp_transport import router as mcp_transport_router
+from memory_mcp.profiling import loop_lag, router as profiling_router
 from memory_mcp.services import jobs
 from memory_mcp.services.job_handlers import (
     handle_distill_turn,
@@ -19,6 +22,8 @@ from memory_mcp.services.job_handlers import (
 )
 from memory_mcp.services.vector_index import ensure_vector_indexes
 
+logger = logging.getLogger(__name__)
+
 
 def create_app() -> FastAPI:
     configure_logging(settings.log_level)
@@ -27,7 +32,7 @@ def create_app() -> FastAPI:
 
     @app.on_event("startup")
     async def startup_event() -> None:
-        await ensure_vector_indexes(engine)
+        app.state.vector_index_task = asyncio.create_task(_build_vector_indexes())
         handlers = {
             "embed_turn": lambda session, payload: handle_embed_turn(session, payload, llm_client),
             "distill_turn": lambda session, payload: handle_distill_turn(session, payload, llm_client),
@@ -39,6 +44,9 @@ def create_app() -> FastAPI:
             jobs.job_worker(session_factory, handlers, stop_event)
         )
         app.state.retention_task = asyncio.create_task(_schedule_retention_jobs())
+        app.state.loop_lag_monitor = asyncio.create_task(loop_lag.run(stop_event))
+        if replicas.engines:
+            app.state.replica_monitor = asyncio.create_task(monitor_replica_lag(stop_event))
 
     @app.on_event("shutdown")
     async def shutdown_event() -> None:
@@ -47,6 +55,13 @@ def create_app() -> FastAPI:
             await app.state.job_worker
         if hasattr(app.state, "retention_task"):
             app.state.retention_task.cancel()
+        if hasattr(app.state, "vector_index_task"):
+            app.state.vector_index_task.cancel()
+        if hasattr(app.state, "loop_lag_monitor"):
+            app.state.loop_lag_monitor.cancel()
+        if hasattr(app.state, "replica_monitor"):
+            app.state.replica_monitor.cancel()
+        await replicas.dispose()
         await llm_client.close()
 
     @app.get("/health")
@@ -61,10 +76,20 @@ def create_app() -> FastAPI:
             data = generate_latest()
             return Response(content=data, media_type=CONTENT_TYPE_LATEST)
 
+    app.include_router(profiling_router, prefix="/debug")
+
     app.include_router(mcp_router, prefix="/mcp")
+    app.include_router(mcp_transport_router, prefix="/mcp/rpc")
     return app
 
 
+async def _build_vector_indexes() -> None:
+    try:
+        await ensure_vector_indexes(engine)
+    except Exception:
+        logger.exception("Vector index build failed")
+
+
 async def _schedule_retention_jobs() -> None:
     while True:
         async with session_factory() as session:
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import time
-from typing import Any
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Union
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import StreamingResponse
 
 from memory_mcp import metrics
-from memory_mcp.db import get_session
+from memory_mcp.config import settings
+from memory_mcp.db import get_session, read_session_factory, session_factory
 from memory_mcp.schemas import (
     AuditCheckRequest,
     DistillExtractRequest,
@@ -27,12 +35,82 @@ from memory_mcp.schemas import (
     SharedImportRequest,
     ThreadCreateRequest,
     TurnIngestRequest,
+    VectorIndexStatusRequest,
+)
+from memory_mcp.services import (
+    admin,
+    audit,
+    decision_state,
+    distill,
+    plans,
+    retrieval,
+    scoring,
+    shared,
+    turns,
+    vector_index,
 )
-from memory_mcp.services import admin, audit, decision_state, distill, plans, retrieval, scoring, shared, turns
 from memory_mcp.services.llm_client import LLMClient
+from memory_mcp.utils.admission import AdmissionController, AdmissionRejected
+from memory_mcp.utils.deadline import DeadlineExceeded, current_deadline, remaining, use_deadline
+from memory_mcp.utils.request_context import track_call, use_request_id
+from memory_mcp.utils.serialization import JSONBytesResponse, dumps
+from memory_mcp.utils.sql_stats import report as report_queries, track_queries
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 llm_client = LLMClient()
+admission = AdmissionController(
+    settings.tool_max_concurrency,
+    settings.tool_max_queue,
+    settings.tool_default_max_concurrency,
+    settings.tool_default_max_queue,
+)
+
+SATURATED_ERROR = -32003
+DEADLINE_ERROR = -32004
+DEADLINE_HEADER = "X-Deadline-Ms"
+REQUEST_ID_HEADER = "X-Request-Id"
+QUERY_CANCELED_SQLSTATE = "57014"
+
+ToolHandler = Callable[[AsyncSession, Any], Awaitable[dict[str, Any]]]
+ToolStreamHandler = Callable[[AsyncSession, Any], AsyncIterator[dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    name: str
+    schema: type[BaseModel]
+    handler: ToolHandler
+    read_only: bool
+    slow: bool
+    description: str
+    stream: ToolStreamHandler | None = None
+
+
+TOOLS: dict[str, ToolSpec] = {}
+
+
+def tool(
+    name: str,
+    schema: type[BaseModel],
+    description: str,
+    read_only: bool = False,
+    slow: bool = False,
+) -> Callable[[ToolHandler], ToolHandler]:
+    def register(handler: ToolHandler) -> ToolHandler:
+        TOOLS[name] = ToolSpec(name, schema, handler, read_only, slow, description)
+        return handler
+
+    return register
+
+
+def tool_stream(name: str) -> Callable[[ToolStreamHandler], ToolStreamHandler]:
+    def register(handler: ToolStreamHandler) -> ToolStreamHandler:
+        TOOLS[name] = replace(TOOLS[name], stream=handler)
+        return handler
+
+    return register
 
 
 class ToolRequest(BaseModel):
@@ -40,144 +118,479 @@ class ToolRequest(BaseModel):
     arguments: dict[str, Any]
 
 
-@router.post("")
-async def mcp_entry(
-    request: ToolRequest, session: AsyncSession = Depends(get_session)
-) -> dict[str, Any]:
-    tool_name = request.tool
-    start = time.time()
-    metrics.tool_calls.labels(tool=tool_name).inc()
-    try:
-        if tool_name == "thread.create":
-            payload = ThreadCreateRequest(**request.arguments)
-            thread = await turns.create_thread(session, payload.plan_id, payload.meta)
-            return {"thread_id": thread.id}
-        if tool_name == "turn.ingest":
-            payload = TurnIngestRequest(**request.arguments)
-            turn = await turns.ingest_turn(
-                session,
-                llm_client,
-                payload.thread_id,
-                payload.role,
-                payload.text,
-                payload.ts,
-                payload.meta,
-                payload.branch_id,
-                payload.external_turn_id,
-                payload.embed_now,
-            )
-            return {"turn_id": turn.id}
-        if tool_name == "plan.create":
-            payload = PlanCreateRequest(**request.arguments)
-            plan = await plans.create_plan(session, payload.name, payload.meta)
-            return {"plan_id": plan.id}
-        if tool_name == "plan.list":
-            payload = PlanListRequest(**request.arguments)
-            items = await plans.list_plans(session, payload.include_archived)
-            return {
-                "plans": [
-                    {
-                        "id": plan.id,
-                        "name": plan.name,
-                        "status": plan.status,
-                        "updated_at": plan.updated_at,
-                    }
-                    for plan in items
-                ]
-            }
-        if tool_name == "plan.get":
-            payload = PlanGetRequest(**request.arguments)
-            plan = await plans.get_plan(session, payload.plan_id)
-            return {
+class BatchToolCall(BaseModel):
+    id: Union[int, str, None] = None
+    tool: str
+    arguments: dict[str, Any] = Field(default_factory=dict)
+
+
+@tool("thread.create", ThreadCreateRequest, "Create a thread under a plan.")
+async def _thread_create(session: AsyncSession, payload: ThreadCreateRequest) -> dict[str, Any]:
+    thread = await turns.create_thread(session, payload.plan_id, payload.meta)
+    return {"thread_id": thread.id}
+
+
+@tool("turn.ingest", TurnIngestRequest, "Store a raw conversation turn.")
+async def _turn_ingest(session: AsyncSession, payload: TurnIngestRequest) -> dict[str, Any]:
+    turn = await turns.ingest_turn(
+        session,
+        llm_client,
+        payload.thread_id,
+        payload.role,
+        payload.text,
+        payload.ts,
+        payload.meta,
+        payload.branch_id,
+        payload.external_turn_id,
+        payload.embed_now,
+    )
+    return {"turn_id": turn.id}
+
+
+@tool("plan.create", PlanCreateRequest, "Create a plan.")
+async def _plan_create(session: AsyncSession, payload: PlanCreateRequest) -> dict[str, Any]:
+    plan = await plans.create_plan(session, payload.name, payload.meta)
+    return {"plan_id": plan.id}
+
+
+@tool("plan.list", PlanListRequest, "List plans.", read_only=True)
+async def _plan_list(session: AsyncSession, payload: PlanListRequest) -> dict[str, Any]:
+    items = await plans.list_plans(session, payload.include_archived)
+    return {
+        "plans": [
+            {
                 "id": plan.id,
                 "name": plan.name,
                 "status": plan.status,
                 "updated_at": plan.updated_at,
-                "meta": plan.meta,
             }
-        if tool_name == "plan.rename":
-            payload = PlanRenameRequest(**request.arguments)
-            plan = await plans.rename_plan(session, payload.plan_id, payload.name)
-            return {"id": plan.id, "name": plan.name}
-        if tool_name == "plan.archive":
-            payload = PlanArchiveRequest(**request.arguments)
-            plan = await plans.archive_plan(session, payload.plan_id, payload.archived)
-            return {"id": plan.id, "status": plan.status}
-        if tool_name == "plan.touch":
-            payload = PlanTouchRequest(**request.arguments)
-            plan = await plans.touch_plan(session, payload.plan_id)
-            return {"id": plan.id, "updated_at": plan.updated_at}
-        if tool_name == "distill.extract":
-            payload = DistillExtractRequest(**request.arguments)
-            return await distill.distill_extract(
-                session,
-                llm_client,
-                payload.thread_id,
-                payload.turn_id,
-                payload.include_recent_turns,
-                payload.write_to_memory,
-            )
-        if tool_name == "retrieve.decision_state":
-            payload = RetrieveDecisionStateRequest(**request.arguments)
-            return await decision_state.decision_state(session, payload.thread_id)
-        if tool_name == "retrieve.context":
-            payload = RetrieveContextRequest(**request.arguments)
-            return await retrieval.retrieve_context(
-                session,
-                llm_client,
-                payload.thread_id,
-                payload.query,
-                payload.mode,
-                payload.scope,
-                payload.top_k,
-                payload.token_budget,
-                payload.recency_bias,
-                payload.explain,
-            )
-        if tool_name == "audit.check_consistency":
-            payload = AuditCheckRequest(**request.arguments)
-            return await audit.audit_consistency(
-                session,
-                llm_client,
-                payload.thread_id,
-                payload.proposed_plan_text,
-                payload.deep,
-            )
-        if tool_name == "memory.deprecate":
-            payload = MemoryDeprecateRequest(**request.arguments)
-            item = await admin.deprecate_item(session, payload.item_id, payload.reason)
-            return {"item_id": item.id, "status": item.status}
-        if tool_name == "memory.supersede":
-            payload = MemorySupersedeRequest(**request.arguments)
-            item = await admin.supersede_item(
-                session, payload.old_item_id, payload.new_item.model_dump(), payload.reason
-            )
-            return {"item_id": item.id, "status": item.status}
-        if tool_name == "score.override":
-            payload = ScoreOverrideRequest(**request.arguments)
-            item = await scoring.override_scores(
-                session,
-                payload.item_id,
-                payload.importance,
-                payload.confidence,
-                payload.severity,
-                payload.reason,
-            )
-            return {"item_id": item.id, "status": item.status}
-        if tool_name == "shared.export":
-            payload = SharedExportRequest(**request.arguments)
-            return await shared.export_shared(
-                session,
-                payload.thread_id,
-                payload.types,
-                payload.include_mistakes,
-                payload.expires_in_minutes,
-            )
-        if tool_name == "shared.import":
-            payload = SharedImportRequest(**request.arguments)
-            return await shared.import_shared(session, payload.payload, payload.signature)
+            for plan in items
+        ]
+    }
+
+
+@tool("plan.get", PlanGetRequest, "Get a plan.", read_only=True)
+async def _plan_get(session: AsyncSession, payload: PlanGetRequest) -> dict[str, Any]:
+    plan = await plans.get_plan(session, payload.plan_id)
+    return {
+        "id": plan.id,
+        "name": plan.name,
+        "status": plan.status,
+        "updated_at": plan.updated_at,
+        "meta": plan.meta,
+    }
+
+
+@tool("plan.rename", PlanRenameRequest, "Rename a plan.")
+async def _plan_rename(session: AsyncSession, payload: PlanRenameRequest) -> dict[str, Any]:
+    plan = await plans.rename_plan(session, payload.plan_id, payload.name)
+    return {"id": plan.id, "name": plan.name}
+
+
+@tool("plan.archive", PlanArchiveRequest, "Archive or restore a plan.")
+async def _plan_archive(session: AsyncSession, payload: PlanArchiveRequest) -> dict[str, Any]:
+    plan = await plans.archive_plan(session, payload.plan_id, payload.archived)
+    return {"id": plan.id, "status": plan.status}
+
+
+@tool("plan.touch", PlanTouchRequest, "Mark a plan as recently used.")
+async def _plan_touch(session: AsyncSession, payload: PlanTouchRequest) -> dict[str, Any]:
+    plan = await plans.touch_plan(session, payload.plan_id)
+    return {"id": plan.id, "updated_at": plan.updated_at}
+
+
+@tool(
+    "distill.extract",
+    DistillExtractRequest,
+    "Distill memory items from recent turns.",
+    slow=True,
+)
+async def _distill_extract(session: AsyncSession, payload: DistillExtractRequest) -> dict[str, Any]:
+    return await distill.distill_extract(
+        session,
+        llm_client,
+        payload.thread_id,
+        payload.turn_id,
+        payload.include_recent_turns,
+        payload.write_to_memory,
+        payload.explain,
+    )
+
+
+@tool(
+    "retrieve.decision_state",
+    RetrieveDecisionStateRequest,
+    "Active decisions, constraints, mistakes, assumptions and open questions.",
+    read_only=True,
+)
+async def _retrieve_decision_state(
+    session: AsyncSession, payload: RetrieveDecisionStateRequest
+) -> dict[str, Any]:
+    return await decision_state.decision_state(session, payload.thread_id)
+
+
+@tool(
+    "retrieve.context",
+    RetrieveContextRequest,
+    "Hybrid retrieval of memory and raw turns within a token budget.",
+    read_only=True,
+    slow=True,
+)
+async def _retrieve_context(session: AsyncSession, payload: RetrieveContextRequest) -> dict[str, Any]:
+    return await retrieval.retrieve_context(
+        session,
+        llm_client,
+        payload.thread_id,
+        payload.query,
+        payload.mode,
+        payload.scope,
+        payload.top_k,
+        payload.token_budget,
+        payload.recency_bias,
+        payload.explain,
+    )
+
+
+@tool_stream("retrieve.context")
+def _retrieve_context_stream(
+    session: AsyncSession, payload: RetrieveContextRequest
+) -> AsyncIterator[dict[str, Any]]:
+    return retrieval.stream_retrieve_context(
+        session,
+        llm_client,
+        payload.thread_id,
+        payload.query,
+        payload.mode,
+        payload.scope,
+        payload.top_k,
+        payload.token_budget,
+        payload.recency_bias,
+        payload.explain,
+    )
+
+
+@tool(
+    "audit.check_consistency",
+    AuditCheckRequest,
+    "Check a proposed plan against active and superseded memory.",
+    read_only=True,
+    slow=True,
+)
+async def _audit_check_consistency(session: AsyncSession, payload: AuditCheckRequest) -> dict[str, Any]:
+    return await audit.audit_consistency(
+        session,
+        llm_client,
+        payload.thread_id,
+        payload.proposed_plan_text,
+        payload.deep,
+        payload.explain,
+    )
+
+
+@tool("memory.deprecate", MemoryDeprecateRequest, "Deprecate a memory item.")
+async def _memory_deprecate(session: AsyncSession, payload: MemoryDeprecateRequest) -> dict[str, Any]:
+    item = await admin.deprecate_item(session, payload.item_id, payload.reason)
+    return {"item_id": item.id, "status": item.status}
+
 
-        raise HTTPException(status_code=404, detail=f"Unknown tool {tool_name}")
+@tool("memory.supersede", MemorySupersedeRequest, "Supersede a memory item with a new one.")
+async def _memory_supersede(session: AsyncSession, payload: MemorySupersedeRequest) -> dict[str, Any]:
+    item = await admin.supersede_item(
+        session, payload.old_item_id, payload.new_item.model_dump(), payload.reason
+    )
+    return {"item_id": item.id, "status": item.status}
+
+
+@tool("score.override", ScoreOverrideRequest, "Override memory item scores.")
+async def _score_override(session: AsyncSession, payload: ScoreOverrideRequest) -> dict[str, Any]:
+    item = await scoring.override_scores(
+        session,
+        payload.item_id,
+        payload.importance,
+        payload.confidence,
+        payload.severity,
+        payload.reason,
+    )
+    return {"item_id": item.id, "status": item.status}
+
+
+@tool("shared.export", SharedExportRequest, "Export a signed memory package.")
+async def _shared_export(session: AsyncSession, payload: SharedExportRequest) -> dict[str, Any]:
+    return await shared.export_shared(
+        session,
+        payload.thread_id,
+        payload.types,
+        payload.include_mistakes,
+        payload.expires_in_minutes,
+    )
+
+
+@tool("shared.import", SharedImportRequest, "Import a signed memory package.")
+async def _shared_import(session: AsyncSession, payload: SharedImportRequest) -> dict[str, Any]:
+    return await shared.import_shared(session, payload.payload, payload.signature)
+
+
+@tool(
+    "vector_index.status",
+    VectorIndexStatusRequest,
+    "Report vector indexes, validity, size and in-progress build progress.",
+)
+async def _vector_index_status(
+    session: AsyncSession, payload: VectorIndexStatusRequest
+) -> dict[str, Any]:
+    return await vector_index.index_status(session)
+
+
+async def call_tool(
+    session: AsyncSession, tool_name: str, arguments: dict[str, Any]
+) -> dict[str, Any]:
+    start = time.time()
+    metrics.tool_calls.labels(tool=tool_name).inc()
+    try:
+        spec = TOOLS.get(tool_name)
+        if spec is None:
+            raise HTTPException(status_code=404, detail=f"Unknown tool {tool_name}")
+        payload = spec.schema(**arguments)
+        with _tool_scope(spec.name):
+            async with asyncio.timeout(remaining()):
+                async with admit(spec.name):
+                    return await spec.handler(session, payload)
     finally:
         duration = time.time() - start
         metrics.tool_latency.labels(tool=tool_name).observe(duration)
+
+
+@contextmanager
+def _tool_scope(tool_name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    with (
+        use_deadline(_default_deadline(tool_name)),
+        track_queries(tool_name) as queries,
+        track_call() as call,
+    ):
+        try:
+            yield
+            outcome = "ok"
+        except Exception as exc:
+            if _is_deadline_error(exc):
+                outcome = "deadline"
+                raise _deadline_exceeded(tool_name) from exc
+            if isinstance(exc, HTTPException) and exc.status_code == 429:
+                outcome = "rejected"
+            raise
+        finally:
+            report_queries(queries)
+            logger.info(
+                "tool call",
+                extra={
+                    "tool": tool_name,
+                    "outcome": outcome,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    "db_ms": round(queries.db_time_s * 1000, 3),
+                    "sql_statements": queries.statements,
+                    "sql_commits": queries.commits,
+                    "llm_ms": round(call.llm_time_s * 1000, 3),
+                    "llm_calls": call.llm_calls,
+                    "tokens": call.tokens,
+                    "cache_hits": call.cache_hits,
+                    "cache_misses": call.cache_misses,
+                },
+            )
+
+
+def request_id(request: Request) -> str | None:
+    return request.headers.get(REQUEST_ID_HEADER)
+
+
+def request_deadline(request: Request) -> float | None:
+    value = request.headers.get(DEADLINE_HEADER)
+    if value is None:
+        return None
+    try:
+        budget_ms = float(value)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid {DEADLINE_HEADER} header") from exc
+    if budget_ms <= 0:
+        raise HTTPException(status_code=400, detail=f"Invalid {DEADLINE_HEADER} header")
+    return min(budget_ms / 1000, settings.tool_max_deadline_s)
+
+
+def _default_deadline(tool_name: str) -> float | None:
+    if current_deadline.get() is not None:
+        return None
+    return settings.tool_deadlines_s.get(tool_name, settings.tool_default_deadline_s)
+
+
+def _is_deadline_error(exc: Exception) -> bool:
+    if isinstance(exc, (DeadlineExceeded, TimeoutError)):
+        return True
+    return isinstance(exc, DBAPIError) and (
+        getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED_SQLSTATE
+    )
+
+
+def _deadline_exceeded(tool_name: str) -> HTTPException:
+    return HTTPException(status_code=504, detail=f"{tool_name} exceeded its deadline")
+
+
+@asynccontextmanager
+async def admit(tool_name: str) -> AsyncIterator[None]:
+    try:
+        async with admission.slot(tool_name) as waited:
+            metrics.tool_queue_wait.labels(tool=tool_name).observe(waited)
+            yield
+    except AdmissionRejected as exc:
+        metrics.tool_rejected.labels(tool=tool_name).inc()
+        raise _saturated(exc) from exc
+
+
+def check_admission(tool_name: str) -> None:
+    try:
+        admission.check(tool_name)
+    except AdmissionRejected as exc:
+        metrics.tool_rejected.labels(tool=tool_name).inc()
+        raise _saturated(exc) from exc
+
+
+def _saturated(exc: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(exc),
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
+
+async def stream_tool(
+    session: AsyncSession, spec: ToolSpec, payload: BaseModel
+) -> AsyncIterator[dict[str, Any]]:
+    start = time.time()
+    metrics.tool_calls.labels(tool=spec.name).inc()
+    try:
+        with _tool_scope(spec.name):
+            async with admit(spec.name):
+                events = spec.stream(session, payload)
+                try:
+                    while True:
+                        # Bound each step, not the yields, so time spent by the consumer
+                        # still counts but cancellation only lands inside the tool.
+                        async with asyncio.timeout(remaining()):
+                            try:
+                                event = await anext(events)
+                            except StopAsyncIteration:
+                                break
+                        yield event
+                finally:
+                    await events.aclose()
+    finally:
+        duration = time.time() - start
+        metrics.tool_latency.labels(tool=spec.name).observe(duration)
+
+
+@router.post("", response_class=JSONBytesResponse)
+async def mcp_entry(
+    request: Union[ToolRequest, List[BatchToolCall]],
+    http_request: Request,
+    session: AsyncSession = Depends(get_session),
+) -> JSONBytesResponse:
+    with use_request_id(request_id(http_request)) as current_id, use_deadline(
+        request_deadline(http_request)
+    ):
+        headers = {REQUEST_ID_HEADER: current_id}
+        if isinstance(request, list):
+            if len(request) > settings.mcp_max_batch_size:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Batch exceeds {settings.mcp_max_batch_size} calls",
+                )
+            return JSONBytesResponse(await _run_batch(session, request), headers=headers)
+        if _is_read_only(request.tool):
+            async with read_session_factory() as read_session:
+                result = await call_tool(read_session, request.tool, request.arguments)
+            return JSONBytesResponse(result, headers=headers)
+        result = await call_tool(session, request.tool, request.arguments)
+        return JSONBytesResponse(result, headers=headers)
+
+
+@router.post("/stream")
+async def mcp_stream(request: ToolRequest, http_request: Request) -> StreamingResponse:
+    spec = TOOLS.get(request.tool)
+    if spec is None or spec.stream is None:
+        raise HTTPException(status_code=404, detail=f"Tool {request.tool} does not stream")
+    try:
+        payload = spec.schema(**request.arguments)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors()) from exc
+    check_admission(spec.name)
+    budget = request_deadline(http_request)
+    stream_id = request_id(http_request) or uuid.uuid4().hex
+
+    async def lines() -> AsyncIterator[bytes]:
+        with use_request_id(stream_id), use_deadline(budget):
+            async with session_for(spec) as session:
+                async for event in stream_tool(session, spec, payload):
+                    yield dumps(event) + b"\n"
+
+    return StreamingResponse(
+        lines(), media_type="application/x-ndjson", headers={REQUEST_ID_HEADER: stream_id}
+    )
+
+
+async def _run_batch(session: AsyncSession, calls: List[BatchToolCall]) -> List[dict[str, Any]]:
+    results: List[dict[str, Any]] = []
+    index = 0
+    while index < len(calls):
+        group = []
+        while index < len(calls) and _is_read_only(calls[index].tool):
+            group.append(calls[index])
+            index += 1
+        if group:
+            results.extend(await asyncio.gather(*[_run_isolated(call) for call in group]))
+            continue
+        results.append(await _run_batch_call(session, calls[index]))
+        index += 1
+    return results
+
+
+def session_for(spec: ToolSpec) -> AsyncSession:
+    return read_session_factory() if spec.read_only else session_factory()
+
+
+def _is_read_only(tool_name: str) -> bool:
+    spec = TOOLS.get(tool_name)
+    return spec is not None and spec.read_only
+
+
+async def _run_isolated(call: BatchToolCall) -> dict[str, Any]:
+    async with read_session_factory() as session:
+        return await _run_batch_call(session, call)
+
+
+async def _run_batch_call(session: AsyncSession, call: BatchToolCall) -> dict[str, Any]:
+    try:
+        result = await call_tool(session, call.tool, call.arguments)
+    except HTTPException as exc:
+        if exc.status_code == 429:
+            return _batch_error(call, SATURATED_ERROR, str(exc.detail))
+        if exc.status_code == 504:
+            await session.rollback()
+            return _batch_error(call, DEADLINE_ERROR, str(exc.detail))
+        if call.tool not in TOOLS:
+            return _batch_error(call, -32601, str(exc.detail))
+        await session.rollback()
+        return _batch_error(call, -32000, str(exc.detail), {"status_code": exc.status_code})
+    except ValidationError as exc:
+        return _batch_error(call, -32602, str(exc))
+    except Exception as exc:
+        await session.rollback()
+        return _batch_error(call, -32000, str(exc))
+    return {"id": call.id, "result": result}
+
+
+def _batch_error(
+    call: BatchToolCall, code: int, message: str, data: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    error: dict[str, Any] = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"id": call.id, "error": error}
@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import ValidationError
+from starlette.responses import Response, StreamingResponse
+
+from memory_mcp.config import settings
+from memory_mcp.mcp_router import (
+    DEADLINE_ERROR,
+    SATURATED_ERROR,
+    TOOLS,
+    ToolSpec,
+    call_tool,
+    REQUEST_ID_HEADER,
+    request_deadline,
+    request_id,
+    session_for,
+    stream_tool,
+)
+from memory_mcp.utils.deadline import use_deadline
+from memory_mcp.utils.request_context import use_request_id
+from memory_mcp.utils.serialization import JSONBytesResponse, dumps
+
+router = APIRouter()
+
+SESSION_HEADER = "Mcp-Session-Id"
+SUPPORTED_PROTOCOL_VERSIONS = ("2025-03-26", "2024-11-05")
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+SESSION_STATE_KEYS = ("thread_id", "plan_id")
+
+
+@dataclass
+class McpSession:
+    id: str
+    protocol_version: str
+    client_info: dict[str, Any]
+    created_at: float = field(default_factory=time.monotonic)
+    last_seen: float = field(default_factory=time.monotonic)
+    state: dict[str, Any] = field(default_factory=dict)
+
+
+class SessionStore:
+    def __init__(self, ttl_s: float, max_sessions: int) -> None:
+        self.ttl_s = ttl_s
+        self.max_sessions = max_sessions
+        self._sessions: dict[str, McpSession] = {}
+
+    def create(self, protocol_version: str, client_info: dict[str, Any]) -> McpSession:
+        self._expire()
+        while len(self._sessions) >= self.max_sessions:
+            oldest = min(self._sessions.values(), key=lambda item: item.last_seen)
+            self._sessions.pop(oldest.id, None)
+        session = McpSession(uuid.uuid4().hex, protocol_version, client_info)
+        self._sessions[session.id] = session
+        return session
+
+    def get(self, session_id: str | None) -> McpSession | None:
+        if session_id is None:
+            return None
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        now = time.monotonic()
+        if now - session.last_seen > self.ttl_s:
+            self._sessions.pop(session_id, None)
+            return None
+        session.last_seen = now
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for session_id, session in list(self._sessions.items()):
+            if now - session.last_seen > self.ttl_s:
+                self._sessions.pop(session_id, None)
+
+
+sessions = SessionStore(settings.mcp_session_ttl_s, settings.mcp_max_sessions)
+
+
+class JsonRpcError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+_tool_list_cache: list[dict[str, Any]] | None = None
+
+
+def tool_definitions() -> list[dict[str, Any]]:
+    global _tool_list_cache
+    if _tool_list_cache is None:
+        _tool_list_cache = [
+            {
+                "name": spec.name,
+                "description": spec.description,
+                "inputSchema": spec.schema.model_json_schema(),
+                "annotations": {"readOnlyHint": spec.read_only},
+            }
+            for spec in TOOLS.values()
+        ]
+    return _tool_list_cache
+
+
+@router.post("")
+async def mcp_stream_post(request: Request) -> Response:
+    try:
+        body = orjson.loads(await request.body())
+    except ValueError:
+        return _json(_error_message(None, PARSE_ERROR, "Parse error"), status_code=400)
+
+    messages = body if isinstance(body, list) else [body]
+    if not messages or not all(isinstance(message, dict) for message in messages):
+        return _json(_error_message(None, INVALID_REQUEST, "Invalid request"), status_code=400)
+
+    if any(message.get("method") == "initialize" for message in messages):
+        if len(messages) != 1:
+            return _json(
+                _error_message(None, INVALID_REQUEST, "initialize must not be batched"),
+                status_code=400,
+            )
+        return _initialize(messages[0])
+
+    session = sessions.get(request.headers.get(SESSION_HEADER))
+    if session is None:
+        if request.headers.get(SESSION_HEADER):
+            raise HTTPException(status_code=404, detail="Unknown or expired MCP session")
+        raise HTTPException(status_code=400, detail=f"Missing {SESSION_HEADER} header")
+
+    requests = [message for message in messages if "id" in message and "method" in message]
+    if not requests:
+        return Response(status_code=202)
+
+    budget = request_deadline(request)
+    current_id = request_id(request) or uuid.uuid4().hex
+    headers = {SESSION_HEADER: session.id, REQUEST_ID_HEADER: current_id}
+    accepts_stream = "text/event-stream" in request.headers.get("accept", "")
+    if accepts_stream and len(requests) == 1 and _is_slow_call(requests[0]):
+        return StreamingResponse(
+            _stream_call(session, requests[0], budget, current_id),
+            media_type="text/event-stream",
+            headers={**headers, "Cache-Control": "no-cache"},
+        )
+
+    with use_request_id(current_id), use_deadline(budget):
+        responses = [await _handle(session, message) for message in requests]
+    payload = responses if isinstance(body, list) else responses[0]
+    return _json(payload, headers=headers)
+
+
+@router.get("")
+async def mcp_stream_get() -> Response:
+    return Response(status_code=405, headers={"Allow": "POST, DELETE"})
+
+
+@router.delete("")
+async def mcp_stream_delete(request: Request) -> Response:
+    session_id = request.headers.get(SESSION_HEADER)
+    if not session_id or not sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Unknown or expired MCP session")
+    return Response(status_code=204)
+
+
+def _initialize(message: dict[str, Any]) -> Response:
+    params = message.get("params") or {}
+    requested = params.get("protocolVersion")
+    version = requested if requested in SUPPORTED_PROTOCOL_VERSIONS else SUPPORTED_PROTOCOL_VERSIONS[0]
+    session = sessions.create(version, params.get("clientInfo") or {})
+    result = {
+        "protocolVersion": version,
+        "capabilities": {"tools": {"listChanged": False}},
+        "serverInfo": {"name": settings.app_name, "version": "1.0.0"},
+    }
+    return _json(
+        {"jsonrpc": "2.0", "id": message.get("id"), "result": result},
+        headers={SESSION_HEADER: session.id},
+    )
+
+
+async def _handle(session: McpSession, message: dict[str, Any]) -> dict[str, Any]:
+    try:
+        result = await _dispatch(session, message)
+    except JsonRpcError as exc:
+        return _error_message(message.get("id"), exc.code, exc.message)
+    return {"jsonrpc": "2.0", "id": message.get("id"), "result": result}
+
+
+async def _dispatch(session: McpSession, message: dict[str, Any]) -> dict[str, Any]:
+    method = message.get("method")
+    params = message.get("params") or {}
+    if method == "ping":
+        return {}
+    if method == "tools/list":
+        return {"tools": tool_definitions()}
+    if method == "tools/call":
+        return await _call(session, params)
+    raise JsonRpcError(METHOD_NOT_FOUND, f"Method not found: {method}")
+
+
+async def _call(session: McpSession, params: dict[str, Any]) -> dict[str, Any]:
+    spec = TOOLS.get(params.get("name", ""))
+    if spec is None:
+        raise JsonRpcError(INVALID_PARAMS, f"Unknown tool: {params.get('name')}")
+    arguments = _with_session_state(session, spec, dict(params.get("arguments") or {}))
+    try:
+        async with session_for(spec) as db_session:
+            result = await call_tool(db_session, spec.name, arguments)
+    except ValidationError as exc:
+        raise JsonRpcError(INVALID_PARAMS, str(exc)) from exc
+    except Exception as exc:
+        code = _overload_error_code(exc)
+        if code is not None:
+            raise JsonRpcError(code, str(exc.detail)) from exc
+        return _tool_result({"error": str(exc)}, is_error=True)
+    _remember_session_state(session, arguments, result)
+    return _tool_result(result)
+
+
+def _with_session_state(
+    session: McpSession, spec: ToolSpec, arguments: dict[str, Any]
+) -> dict[str, Any]:
+    # Only required fields are filled in; an optional field the caller left out stays unset
+    # instead of silently inheriting a value from an unrelated earlier call.
+    fields = spec.schema.model_fields
+    for key in SESSION_STATE_KEYS:
+        if (
+            key in fields
+            and fields[key].is_required()
+            and key not in arguments
+            and key in session.state
+        ):
+            arguments[key] = session.state[key]
+    return arguments
+
+
+def _remember_session_state(
+    session: McpSession, arguments: dict[str, Any], result: dict[str, Any]
+) -> None:
+    for key in SESSION_STATE_KEYS:
+        value = result.get(key, arguments.get(key))
+        if value is not None:
+            session.state[key] = str(value)
+
+
+def _tool_result(result: dict[str, Any], is_error: bool = False) -> dict[str, Any]:
+    return {
+        "content": [{"type": "text", "text": dumps(result).decode("utf-8")}],
+        "structuredContent": result,
+        "isError": is_error,
+    }
+
+
+def _overload_error_code(exc: Exception) -> int | None:
+    if not isinstance(exc, HTTPException):
+        return None
+    return {429: SATURATED_ERROR, 504: DEADLINE_ERROR}.get(exc.status_code)
+
+
+def _is_slow_call(message: dict[str, Any]) -> bool:
+    if message.get("method") != "tools/call":
+        return False
+    spec = TOOLS.get((message.get("params") or {}).get("name", ""))
+    return spec is not None and spec.slow
+
+
+async def _stream_call(
+    session: McpSession, message: dict[str, Any], budget: float | None, current_id: str
+) -> AsyncIterator[bytes]:
+    with use_request_id(current_id), use_deadline(budget):
+        async for event in _stream_events(session, message):
+            yield event
+
+
+async def _stream_events(session: McpSession, message: dict[str, Any]) -> AsyncIterator[bytes]:
+    params = message.get("params") or {}
+    progress_token = (params.get("_meta") or {}).get("progressToken")
+    spec = TOOLS[params["name"]]
+    if spec.stream is not None:
+        async for event in _stream_partial_results(session, message, spec, progress_token):
+            yield event
+        return
+    task = asyncio.create_task(_handle(session, message))
+    progress = 0
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=settings.mcp_progress_interval_s)
+            if done:
+                break
+            progress += 1
+            if progress_token is None:
+                yield b": keep-alive\n\n"
+                continue
+            yield _sse(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "notifications/progress",
+                    "params": {
+                        "progressToken": progress_token,
+                        "progress": progress,
+                        "message": f"{params.get('name')} running",
+                    },
+                }
+            )
+        yield _sse(task.result())
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def _stream_partial_results(
+    session: McpSession, message: dict[str, Any], spec: ToolSpec, progress_token: Any
+) -> AsyncIterator[bytes]:
+    params = message.get("params") or {}
+    arguments = _with_session_state(session, spec, dict(params.get("arguments") or {}))
+    try:
+        payload = spec.schema(**arguments)
+    except ValidationError as exc:
+        yield _sse(_error_message(message.get("id"), INVALID_PARAMS, str(exc)))
+        return
+    result: dict[str, Any] | None = None
+    progress = 0
+    try:
+        async with session_for(spec) as db_session:
+            async for event in stream_tool(db_session, spec, payload):
+                if event.get("event") == "done":
+                    result = event["result"]
+                    continue
+                progress += 1
+                if progress_token is not None:
+                    yield _sse(
+                        {
+                            "jsonrpc": "2.0",
+                            "method": "notifications/progress",
+                            "params": {
+                                "progressToken": progress_token,
+                                "progress": progress,
+                                "message": dumps(event).decode("utf-8"),
+                            },
+                        }
+                    )
+    except Exception as exc:
+        code = _overload_error_code(exc)
+        if code is not None:
+            yield _sse(_error_message(message.get("id"), code, str(exc.detail)))
+            return
+        error_result = _tool_result({"error": str(exc)}, is_error=True)
+        yield _sse({"jsonrpc": "2.0", "id": message.get("id"), "result": error_result})
+        return
+    if result is None:
+        yield _sse(_error_message(message.get("id"), INTERNAL_ERROR, "Stream ended without a result"))
+        return
+    _remember_session_state(session, arguments, result)
+    yield _sse({"jsonrpc": "2.0", "id": message.get("id"), "result": _tool_result(result)})
+
+
+def _sse(payload: dict[str, Any]) -> bytes:
+    return b"event: message\ndata: " + dumps(payload) + b"\n\n"
+
+
+def _error_message(message_id: Any, code: int, text: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": message_id, "error": {"code": code, "message": text}}
+
+
+def _json(payload: Any, status_code: int = 200, headers: dict[str, str] | None = None) -> Response:
+    return JSONBytesResponse(payload, status_code=status_code, headers=headers)
@@ -1,12 +1,97 @@
 from __future__ import annotations
 
-from prometheus_client import Counter, Histogram
+from typing import Any, Iterator
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
 
 
 tool_calls = Counter("tool_call_count", "MCP tool call count", ["tool"])
 tool_latency = Histogram("tool_latency_seconds", "Tool latency", ["tool"])
+tool_queue_wait = Histogram(
+    "tool_queue_wait_seconds", "Time a tool call waited for admission", ["tool"]
+)
+stage_latency = Histogram(
+    "stage_latency_seconds", "Latency of a stage inside a tool call", ["operation", "stage"]
+)
+tool_rejected = Counter("tool_rejected_count", "Tool calls shed by admission control", ["tool"])
 llm_calls = Counter("llm_call_count", "LLM call count", ["type"])
 llm_failures = Counter("llm_call_failures", "LLM call failures", ["type"])
 retrieval_low_confidence = Counter(
     "retrieval_low_confidence_count", "Low confidence retrieval count"
 )
+llm_http_pool_connections = Gauge(
+    "llm_http_pool_connections", "LLM HTTP pool connections", ["state"]
+)
+llm_http_pool_wait = Histogram(
+    "llm_http_pool_wait_seconds", "Time spent waiting for an LLM HTTP connection"
+)
+llm_rate_limit_wait = Histogram(
+    "llm_rate_limit_wait_seconds", "Time spent waiting on the LLM rate limiter", ["type"]
+)
+llm_rate_limited = Counter("llm_rate_limited_count", "LLM 429 responses", ["type"])
+llm_lane_wait = Histogram(
+    "llm_lane_wait_seconds", "Time spent waiting for an LLM concurrency slot", ["lane"]
+)
+llm_hedged_requests = Counter(
+    "llm_hedged_request_count", "Hedged LLM embedding requests", ["outcome"]
+)
+db_replica_lag = Gauge("db_replica_lag_seconds", "Replica replay lag", ["replica"])
+db_pool_connections = Gauge(
+    "db_pool_connections", "Database pool connections", ["engine", "state"]
+)
+db_pool_wait = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a database connection", ["engine"]
+)
+sql_statements = Histogram(
+    "sql_statements_per_call",
+    "SQL statements issued per tool call",
+    ["operation"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+sql_duration = Histogram(
+    "sql_duration_seconds", "Total SQL time per tool call", ["operation"]
+)
+sql_commits = Counter("sql_commit_count", "Commits issued by tool calls", ["operation"])
+sql_repeated_statements = Counter(
+    "sql_repeated_statement_count", "Repeated SELECTs in one tool call (possible N+1)", ["operation"]
+)
+event_loop_lag = Histogram(
+    "event_loop_lag_seconds",
+    "Event loop scheduling lag",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+event_loop_lag_spikes = Counter(
+    "event_loop_lag_spike_count", "Event loop lag samples above the threshold"
+)
+vector_index_build_progress = Gauge(
+    "vector_index_build_progress_ratio", "Vector index build progress", ["index"]
+)
+vector_index_builds = Counter("vector_index_build_count", "Vector index builds", ["outcome"])
+
+
+class CacheCollector:
+    def __init__(self) -> None:
+        self._caches: dict[str, Any] = {}
+
+    def track(self, name: str, cache: Any) -> None:
+        self._caches[name] = cache
+
+    def collect(self) -> Iterator[Metric]:
+        families = {
+            "hits": CounterMetricFamily("cache_hits", "Cache hits", labels=["cache"]),
+            "misses": CounterMetricFamily("cache_misses", "Cache misses", labels=["cache"]),
+            "evictions": CounterMetricFamily(
+                "cache_evictions", "Cache evictions", labels=["cache"]
+            ),
+            "entries": GaugeMetricFamily("cache_entries", "Cached entries", labels=["cache"]),
+            "bytes": GaugeMetricFamily("cache_bytes", "Estimated cache size", labels=["cache"]),
+        }
+        for name, cache in self._caches.items():
+            for key, value in cache.stats().items():
+                families[key].add_metric([name], value)
+        yield from families.values()
+
+
+cache_collector = CacheCollector()
+REGISTRY.register(cache_collector)
@@ -61,7 +61,6 @@ class Turn(Base):
 
 Index("ix_turns_thread_ts", Turn.thread_id, Turn.ts.desc())
 Index("ix_turns_tsv", Turn.tsv, postgresql_using="gin")
-Index("ix_turns_embedding", Turn.embedding, postgresql_using="ivfflat")
 
 
 class MemoryItem(Base):
@@ -113,7 +112,6 @@ Index(
 Index("ix_memory_tags", MemoryItem.tags, postgresql_using="gin")
 Index("ix_memory_affects", MemoryItem.affects, postgresql_using="gin")
 Index("ix_memory_tsv", MemoryItem.tsv, postgresql_using="gin")
-Index("ix_memory_embedding", MemoryItem.embedding, postgresql_using="ivfflat")
 
 
 class SharedPackage(Base):
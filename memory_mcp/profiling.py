@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from starlette.responses import PlainTextResponse
+
+from memory_mcp.config import settings
+from memory_mcp.metrics import event_loop_lag, event_loop_lag_spikes
+
+router = APIRouter()
+_profile_lock = asyncio.Lock()
+
+
+def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _walk(frame: FrameType | None) -> list[str]:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def collapse(samples: Counter[tuple[str, ...]]) -> str:
+    return "".join(
+        f"{';'.join(stack)} {count}\n" for stack, count in samples.most_common() if stack
+    )
+
+
+def sample_threads(seconds: float, interval_s: float) -> Counter[tuple[str, ...]]:
+    sampler_id = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    samples: Counter[tuple[str, ...]] = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == sampler_id:
+                continue
+            thread_name = names.get(thread_id) or str(thread_id)
+            samples[(f"thread {thread_name}", *_walk(frame))] += 1
+        time.sleep(interval_s)
+    return samples
+
+
+def _task_stack(task: asyncio.Task[Any]) -> list[str]:
+    return [_frame_label(frame) for frame in task.get_stack()]
+
+
+async def sample_tasks(seconds: float, interval_s: float) -> Counter[tuple[str, ...]]:
+    current = asyncio.current_task()
+    samples: Counter[tuple[str, ...]] = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for task in asyncio.all_tasks():
+            if task is current:
+                continue
+            samples[(f"task {task.get_name()}", *_task_stack(task))] += 1
+        await asyncio.sleep(interval_s)
+    return samples
+
+
+def dump_tasks(limit: int) -> list[dict[str, Any]]:
+    tasks = [
+        {
+            "name": task.get_name(),
+            "coro": getattr(task.get_coro(), "__qualname__", repr(task.get_coro())),
+            "done": task.done(),
+            "stack": [
+                f"{_frame_label(frame)} line {frame.f_lineno}"
+                for frame in task.get_stack(limit=limit)
+            ],
+        }
+        for task in asyncio.all_tasks()
+    ]
+    return sorted(tasks, key=lambda item: item["name"])
+
+
+class LoopLagMonitor:
+    def __init__(self, threshold_s: float, interval_s: float) -> None:
+        self.threshold_s = threshold_s
+        self.interval_s = interval_s
+        self.spikes = 0
+        self.last_lag_s = 0.0
+        self.max_lag_s = 0.0
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        while not stop_event.is_set():
+            started = loop.time()
+            await asyncio.sleep(self.interval_s)
+            self.observe(max(0.0, loop.time() - started - self.interval_s))
+
+    def observe(self, lag_s: float) -> None:
+        self.last_lag_s = lag_s
+        self.max_lag_s = max(self.max_lag_s, lag_s)
+        event_loop_lag.observe(lag_s)
+        if lag_s > self.threshold_s:
+            self.spikes += 1
+            event_loop_lag_spikes.inc()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "threshold_ms": self.threshold_s * 1000,
+            "spikes": self.spikes,
+            "last_lag_ms": round(self.last_lag_s * 1000, 3),
+            "max_lag_ms": round(self.max_lag_s * 1000, 3),
+        }
+
+
+loop_lag = LoopLagMonitor(
+    settings.loop_lag_threshold_ms / 1000, settings.loop_lag_check_interval_s
+)
+
+
+@router.get("/profile", dependencies=[Depends(require_admin)])
+async def profile(
+    seconds: float = Query(default=5.0, gt=0),
+    mode: str = Query(default="threads", pattern="^(threads|tasks)$"),
+) -> PlainTextResponse:
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    seconds = min(seconds, settings.profile_max_seconds)
+    async with _profile_lock:
+        if mode == "tasks":
+            samples = await sample_tasks(seconds, settings.profile_sample_interval_s)
+        else:
+            samples = await asyncio.to_thread(
+                sample_threads, seconds, settings.profile_sample_interval_s
+            )
+    return PlainTextResponse(collapse(samples))
+
+
+@router.get("/tasks", dependencies=[Depends(require_admin)])
+async def tasks(limit: int = Query(default=20, gt=0)) -> dict[str, Any]:
+    dumped = dump_tasks(limit)
+    return {"count": len(dumped), "tasks": dumped}
+
+
+@router.get("/loop-lag", dependencies=[Depends(require_admin)])
+async def loop_lag_stats() -> dict[str, float]:
+    return loop_lag.stats()
@@ -62,6 +62,7 @@ class DistillExtractRequest(BaseModel):
     turn_id: UUID
     include_recent_turns: int = 4
     write_to_memory: bool = True
+    explain: bool = False
 
 
 class DistillItem(BaseModel):
@@ -171,6 +172,7 @@ class AuditCheckRequest(BaseModel):
     thread_id: UUID
     proposed_plan_text: str
     deep: bool = False
+    explain: bool = False
 
 
 class AuditCheckResponse(BaseModel):
@@ -237,3 +239,7 @@ class SharedImportResponse(BaseModel):
     imported_count: int
     thread_id_created: UUID
     items: List[dict[str, Any]]
+
+
+class VectorIndexStatusRequest(BaseModel):
+    pass
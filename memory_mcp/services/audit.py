@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Any, List
 from uuid import UUID
 
 from sqlalchemy import select
@@ -11,6 +11,7 @@ from memory_mcp.prompts import AUDIT_SYSTEM_PROMPT
 from memory_mcp.schemas import MemoryStatus
 from memory_mcp.services.llm_client import LLMClient
 from memory_mcp.services.stale import find_stale_references
+from memory_mcp.utils.stages import stage, timed_operation
 
 
 async def audit_consistency(
@@ -19,14 +20,32 @@ async def audit_consistency(
     thread_id: UUID,
     plan_text: str,
     deep: bool,
-) -> dict[str, List[str]]:
-    active_items = await _load_items(session, thread_id, MemoryStatus.active)
-    superseded_items = await _load_items(session, thread_id, MemoryStatus.superseded)
+    explain: bool = False,
+) -> dict[str, Any]:
+    with timed_operation("audit.check_consistency") as timer:
+        result = await _audit_consistency(session, llm, thread_id, plan_text, deep)
+    if explain:
+        result["stages_ms"] = timer.as_ms()
+    return result
 
-    stale_refs = await find_stale_references(session, thread_id, plan_text)
+
+async def _audit_consistency(
+    session: AsyncSession,
+    llm: LLMClient,
+    thread_id: UUID,
+    plan_text: str,
+    deep: bool,
+) -> dict[str, Any]:
+    with stage("load_items"):
+        active_items = await _load_items(session, thread_id, MemoryStatus.active)
+        superseded_items = await _load_items(session, thread_id, MemoryStatus.superseded)
+
+    with stage("stale_refs"):
+        stale_refs = await find_stale_references(session, thread_id, plan_text)
 
     if deep:
-        response = await _audit_with_llm(llm, plan_text, active_items, superseded_items)
+        with stage("llm_audit"):
+            response = await _audit_with_llm(llm, plan_text, active_items, superseded_items)
         response["stale_references"] = list(set(response.get("stale_references", []) + stale_refs))
         return response
 
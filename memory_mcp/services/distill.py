@@ -10,6 +10,7 @@ from memory_mcp.schemas import DistillResult, MemoryType
 from memory_mcp.services.llm_client import LLMClient
 from memory_mcp.services.memory_items import upsert_memory_item
 from memory_mcp.services.turns import get_recent_turns
+from memory_mcp.utils.stages import stage, timed_operation
 
 
 async def distill_extract(
@@ -19,8 +20,27 @@ async def distill_extract(
     turn_id: UUID,
     include_recent_turns: int,
     write_to_memory: bool,
+    explain: bool = False,
 ) -> dict[str, Any]:
-    turns = await get_recent_turns(session, thread_id, include_recent_turns)
+    with timed_operation("distill.extract") as timer:
+        result = await _distill_extract(
+            session, llm, thread_id, turn_id, include_recent_turns, write_to_memory
+        )
+    if explain:
+        result["stages_ms"] = timer.as_ms()
+    return result
+
+
+async def _distill_extract(
+    session: AsyncSession,
+    llm: LLMClient,
+    thread_id: UUID,
+    turn_id: UUID,
+    include_recent_turns: int,
+    write_to_memory: bool,
+) -> dict[str, Any]:
+    with stage("load_turns"):
+        turns = await get_recent_turns(session, thread_id, include_recent_turns)
     turns_text = "\n".join([f"{turn.role}: {turn.text}" for turn in reversed(turns)])
 
     messages = [
@@ -33,7 +53,8 @@ async def distill_extract(
             "content": f"Conversation:\n{turns_text}",
         },
     ]
-    response = await llm.chat_json(messages)
+    with stage("llm_extract"):
+        response = await llm.chat_json(messages)
     extracted = DistillResult(**response)
 
     inserted = 0
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+import numpy as np
+
+from memory_mcp.config import settings
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class EmbeddingProvider(ABC):
+    name = "base"
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        ...
+
+    async def close(self) -> None:
+        return None
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    name = "hashing"
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.to_thread(lambda: self.embed_batch(texts).tolist())
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        rows: list[int] = []
+        hashes: list[int] = []
+        for row, text in enumerate(texts):
+            for token in _TOKEN_PATTERN.findall(text.lower()):
+                digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+                hashes.append(int.from_bytes(digest, "little"))
+                rows.append(row)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if hashes:
+            values = np.array(hashes, dtype=np.uint64)
+            columns = (values % np.uint64(self.dim)).astype(np.intp)
+            signs = np.where((values >> np.uint64(63)) == 0, 1.0, -1.0).astype(np.float32)
+            np.add.at(matrix, (np.array(rows, dtype=np.intp), columns), signs)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class _ThreadPoolProvider(EmbeddingProvider):
+    def __init__(self, batch_size: int, threads: int) -> None:
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix=f"embed-{self.name}"
+        )
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        if not self._loaded:
+            async with self._load_lock:
+                if not self._loaded:
+                    await loop.run_in_executor(self._executor, self._load)
+                    self._loaded = True
+        batches = [
+            texts[start : start + self.batch_size]
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        results = await asyncio.gather(
+            *[loop.run_in_executor(self._executor, self._encode, batch) for batch in batches]
+        )
+        vectors = [vector for batch in results for vector in batch]
+        if vectors and len(vectors[0]) != settings.embedding_dim:
+            raise RuntimeError(
+                f"Local embedding model returned {len(vectors[0])} dims, "
+                f"EMBEDDING_DIM is {settings.embedding_dim}"
+            )
+        return vectors
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @abstractmethod
+    def _load(self) -> None:
+        ...
+
+    @abstractmethod
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        ...
+
+
+class OnnxEmbeddingProvider(_ThreadPoolProvider):
+    name = "onnx"
+
+    def __init__(self, model_dir: str, batch_size: int, threads: int, max_length: int) -> None:
+        super().__init__(batch_size, threads)
+        self.model_dir = model_dir
+        self.threads = threads
+        self.max_length = max_length
+        self._session: Any = None
+        self._tokenizer: Any = None
+        self._input_names: set[str] = set()
+
+    def _load(self) -> None:
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as exc:
+            raise RuntimeError(
+                "EMBEDDING_PROVIDER=onnx requires onnxruntime and tokenizers"
+            ) from exc
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = self.threads
+        self._session = onnxruntime.InferenceSession(
+            os.path.join(self.model_dir, "model.onnx"),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {item.name for item in self._session.get_inputs()}
+        tokenizer = Tokenizer.from_file(os.path.join(self.model_dir, "tokenizer.json"))
+        tokenizer.enable_truncation(max_length=self.max_length)
+        tokenizer.enable_padding()
+        self._tokenizer = tokenizer
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        encoded = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([item.ids for item in encoded], dtype=np.int64)
+        attention_mask = np.array([item.attention_mask for item in encoded], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        hidden = self._session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (pooled / norms).tolist()
+
+
+class SentenceTransformerEmbeddingProvider(_ThreadPoolProvider):
+    name = "sentence_transformers"
+
+    def __init__(self, model_name: str, batch_size: int, threads: int) -> None:
+        super().__init__(batch_size, threads)
+        self.model_name = model_name
+        self._model: Any = None
+
+    def _load(self) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as exc:
+            raise RuntimeError(
+                "EMBEDDING_PROVIDER=sentence_transformers requires sentence-transformers"
+            ) from exc
+        self._model = SentenceTransformer(self.model_name, device="cpu")
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        return vectors.tolist()
+
+
+def build_embedding_provider() -> EmbeddingProvider | None:
+    provider = settings.embedding_provider.lower()
+    if provider == "remote":
+        return None
+    if provider == "hashing":
+        return HashingEmbeddingProvider(settings.embedding_dim)
+    if provider == "onnx":
+        return OnnxEmbeddingProvider(
+            settings.embedding_local_model,
+            settings.embedding_local_batch_size,
+            settings.embedding_local_threads,
+            settings.embedding_local_max_length,
+        )
+    if provider == "sentence_transformers":
+        return SentenceTransformerEmbeddingProvider(
+            settings.embedding_local_model,
+            settings.embedding_local_batch_size,
+            settings.embedding_local_threads,
+        )
+    raise ValueError(f"Unknown EMBEDDING_PROVIDER {settings.embedding_provider}")
@@ -9,6 +9,7 @@ from memory_mcp.models import Turn
 from memory_mcp.services import distill
 from memory_mcp.services.llm_client import LLMClient
 from memory_mcp.services.retention import apply_retention
+from memory_mcp.utils.priority import Priority, use_priority
 
 
 async def handle_embed_turn(
@@ -19,7 +20,8 @@ async def handle_embed_turn(
     turn = result.scalar_one()
     if turn.embedding is not None:
         return
-    embeddings = await llm.embed([payload.get("text", turn.text)])
+    with use_priority(Priority.background):
+        embeddings = await llm.embed([payload.get("text", turn.text)])
     await session.execute(
         update(Turn).where(Turn.id == turn_id).values(embedding=embeddings[0])
     )
@@ -29,14 +31,15 @@ async def handle_embed_turn(
 async def handle_distill_turn(
     session: AsyncSession, payload: dict, llm: LLMClient
 ) -> None:
-    await distill.distill_extract(
-        session,
-        llm,
-        UUID(payload["thread_id"]),
-        UUID(payload["turn_id"]),
-        include_recent_turns=4,
-        write_to_memory=True,
-    )
+    with use_priority(Priority.background):
+        await distill.distill_extract(
+            session,
+            llm,
+            UUID(payload["thread_id"]),
+            UUID(payload["turn_id"]),
+            include_recent_turns=4,
+            write_to_memory=True,
+        )
 
 
 async def handle_retention_cleanup(session: AsyncSession, payload: dict, llm: LLMClient) -> None:
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from memory_mcp.config import settings
 from memory_mcp.models import Job
+from memory_mcp.utils.request_context import use_request_id
 
 
 JobHandler = Callable[[AsyncSession, dict[str, Any]], Coroutine[Any, Any, None]]
@@ -94,9 +95,10 @@ async def job_worker(
             if handler is None:
                 await fail_job(session, job, "Unknown job type")
                 continue
-            try:
-                await handler(session, job.payload)
-                await complete_job(session, job)
-            except Exception as exc:
-                await fail_job(session, job, str(exc))
+            with use_request_id(f"job-{job.id}"):
+                try:
+                    await handler(session, job.payload)
+                    await complete_job(session, job)
+                except Exception as exc:
+                    await fail_job(session, job, str(exc))
         await asyncio.sleep(settings.job_poll_interval_s)
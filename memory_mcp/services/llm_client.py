@@ -1,17 +1,45 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import hashlib
 import json
+import random
 import time
-from typing import Any, List
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List
 
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    RetryCallState,
+    RetryError,
+    retry,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    stop_any,
+    wait_exponential,
+)
 
 from memory_mcp.config import settings
-from memory_mcp.metrics import llm_calls, llm_failures
+from memory_mcp.services.embedding_providers import build_embedding_provider
+from memory_mcp.metrics import (
+    cache_collector,
+    llm_calls,
+    llm_failures,
+    llm_http_pool_connections,
+    llm_http_pool_wait,
+    llm_lane_wait,
+    llm_rate_limit_wait,
+    llm_rate_limited,
+)
 from memory_mcp.utils.cache import LRUCache
+from memory_mcp.utils.deadline import DeadlineExceeded, bounded, check_deadline, remaining
+from memory_mcp.utils.hedging import HedgePolicy, hedged_call
+from memory_mcp.utils.priority import Priority, PriorityLimiter, current_priority
+from memory_mcp.utils.rate_limiter import RateLimiter, parse_reset_duration
+from memory_mcp.utils.request_context import record_cache, record_llm
+from memory_mcp.utils.singleflight import SingleFlight
+from memory_mcp.utils.token_estimator import estimate_tokens
 
 
 class CircuitBreaker:
@@ -40,6 +68,29 @@ class CircuitBreaker:
         return False
 
 
+def _retry_after(headers: httpx.Headers) -> float:
+    for name in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        delay = parse_reset_duration(headers.get(name))
+        if delay:
+            return delay
+    return 1.0
+
+
+_retry_wait = wait_exponential()
+
+
+def _out_of_budget(retry_state: RetryCallState) -> bool:
+    budget = remaining()
+    return budget is not None and budget <= _retry_wait(retry_state)
+
+
+def _retry_exhausted(retry_state: RetryCallState) -> Any:
+    error = retry_state.outcome.exception()
+    if _out_of_budget(retry_state):
+        raise DeadlineExceeded("Deadline leaves no room for another LLM retry") from error
+    raise RetryError(retry_state.outcome) from error
+
+
 class LLMClient:
     def __init__(self) -> None:
         self.base_url = settings.llm_base_url
@@ -48,65 +99,154 @@ class LLMClient:
         self.circuit = CircuitBreaker(
             settings.llm_circuit_breaker_failures, settings.llm_circuit_breaker_ttl_s
         )
-        self._client = httpx.AsyncClient(timeout=self.timeout)
-        self._embedding_cache = LRUCache(settings.cache_max_entries, settings.cache_ttl_s)
-        self._semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+        self._transport = httpx.AsyncHTTPTransport(
+            http2=settings.llm_http2,
+            limits=httpx.Limits(
+                max_connections=settings.llm_http_max_connections,
+                max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+                keepalive_expiry=settings.llm_http_keepalive_expiry_s,
+            ),
+        )
+        self._client = httpx.AsyncClient(
+            transport=self._transport,
+            timeout=httpx.Timeout(self.timeout, pool=settings.llm_http_pool_timeout_s),
+        )
+        self._embedding_cache = LRUCache(
+            settings.cache_max_entries, settings.cache_ttl_s, settings.cache_max_bytes
+        )
+        cache_collector.track("embedding", self._embedding_cache)
+        self._lanes = PriorityLimiter(
+            settings.llm_max_concurrency,
+            {
+                Priority.interactive: settings.llm_interactive_max_concurrency,
+                Priority.background: settings.llm_background_max_concurrency,
+            },
+        )
+        self._hedge_policy = HedgePolicy(
+            settings.llm_hedge_percentile,
+            settings.llm_hedge_min_delay_s,
+            settings.llm_hedge_max_rate,
+            settings.llm_hedge_window,
+        )
+        self._rate_limiters = {
+            "embed": RateLimiter(settings.embedding_rpm_limit, settings.embedding_tpm_limit),
+            "chat": RateLimiter(settings.llm_rpm_limit, settings.llm_tpm_limit),
+        }
+        self._local_embedder = build_embedding_provider()
+        self._embed_flight = SingleFlight()
+        self._chat_flight = SingleFlight()
 
     async def close(self) -> None:
         await self._client.aclose()
+        if self._local_embedder is not None:
+            await self._local_embedder.close()
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        priority = current_priority.get()
+        started = time.perf_counter()
+        async with self._lanes.slot(priority):
+            llm_lane_wait.labels(lane=priority.name).observe(time.perf_counter() - started)
+            yield
+
+    def _should_hedge(self, batch_size: int) -> bool:
+        return (
+            settings.llm_hedge_enabled
+            and batch_size <= settings.llm_hedge_max_batch
+            and current_priority.get() == Priority.interactive
+        )
 
     def _headers(self) -> dict[str, str]:
         return {"Authorization": f"Bearer {self.api_key}"}
 
     async def embed(self, texts: List[str]) -> List[List[float]]:
         if settings.fake_llm:
+            await self._fake_latency(sum(estimate_tokens(text) for text in texts))
             return [self._fake_embedding(text) for text in texts]
+        vectors = [self._embedding_cache.get(text) for text in texts]
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        record_cache(len(texts) - len(missing), len(missing))
+        if not missing:
+            return vectors
+        owned, waiting = self._embed_flight.claim(missing)
+        found: dict[str, List[float]] = {}
+        if owned:
+            fetch = self._embed_local if self._local_embedder is not None else self._embed_remote
+            try:
+                embedded = await fetch(list(owned))
+            except BaseException as exc:
+                self._embed_flight.fail(owned, exc)
+                raise
+            for text, vector in zip(owned, embedded):
+                self._embedding_cache.set(text, vector)
+                self._embed_flight.resolve(owned, text, vector)
+                found[text] = vector
+            if len(found) < len(owned):
+                error = RuntimeError("Embedding missing from response")
+                self._embed_flight.fail(owned, error)
+                raise error
+        for text, future in waiting.items():
+            found[text] = await asyncio.shield(future)
+        return [vector if vector is not None else found[text] for text, vector in zip(texts, vectors)]
+
+    async def _embed_remote(self, texts: List[str]) -> List[List[float]]:
         if not self.circuit.allow():
             raise RuntimeError("LLM circuit breaker open")
         try:
             llm_calls.labels(type="embed").inc()
-            async with self._semaphore:
-                vectors: List[List[float] | None] = [None] * len(texts)
-                missing = []
-                missing_indexes = []
-                for idx, text in enumerate(texts):
-                    cached = self._embedding_cache.get(text)
-                    if cached is not None:
-                        vectors[idx] = cached
-                    else:
-                        missing.append(text)
-                        missing_indexes.append(idx)
-                if missing:
-                    payload = {"model": settings.embedding_model, "input": missing}
-                    response = await self._post("/embeddings", payload)
-                    data = response["data"]
-                    for item, text, idx in zip(data, missing, missing_indexes):
-                        embedding = item["embedding"]
-                        self._embedding_cache.set(text, embedding)
-                        vectors[idx] = embedding
+            payload = {"model": settings.embedding_model, "input": texts}
+            tokens = sum(estimate_tokens(text) for text in texts)
+            if self._should_hedge(len(texts)):
+                response = await hedged_call(
+                    lambda: self._post("/embeddings", payload, "embed", tokens),
+                    self._hedge_policy,
+                )
+            else:
+                response = await self._post("/embeddings", payload, "embed", tokens)
             self.circuit.record_success()
-            return [vector for vector in vectors if vector is not None]
+            return [item["embedding"] for item in response["data"]]
         except Exception:
             llm_failures.labels(type="embed").inc()
             self.circuit.record_failure()
             raise
 
+    async def _embed_local(self, texts: List[str]) -> List[List[float]]:
+        llm_calls.labels(type="embed_local").inc()
+        started = time.perf_counter()
+        try:
+            vectors = await self._local_embedder.embed(texts)
+            record_llm(time.perf_counter() - started, sum(estimate_tokens(text) for text in texts))
+            return vectors
+        except Exception:
+            llm_failures.labels(type="embed_local").inc()
+            raise
+
     async def chat_json(self, messages: List[dict[str, str]]) -> dict[str, Any]:
         if settings.fake_llm:
+            await self._fake_latency(sum(estimate_tokens(message["content"]) for message in messages))
             return self._fake_chat_response(messages)
+        key = hashlib.sha256(
+            json.dumps(messages, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        response = await self._chat_flight.do(key, lambda: self._chat_remote(messages))
+        return copy.deepcopy(response)
+
+    async def _chat_remote(self, messages: List[dict[str, str]]) -> dict[str, Any]:
         if not self.circuit.allow():
             raise RuntimeError("LLM circuit breaker open")
         try:
             llm_calls.labels(type="chat").inc()
-            async with self._semaphore:
-                payload = {
-                    "model": settings.llm_model,
-                    "messages": messages,
-                    "response_format": {"type": "json_object"},
-                }
-                response = await self._post("/chat/completions", payload)
-                content = response["choices"][0]["message"]["content"]
-                parsed = json.loads(content)
+            payload = {
+                "model": settings.llm_model,
+                "messages": messages,
+                "response_format": {"type": "json_object"},
+            }
+            tokens = settings.llm_completion_tokens_estimate + sum(
+                estimate_tokens(message["content"]) for message in messages
+            )
+            response = await self._post("/chat/completions", payload, "chat", tokens)
+            content = response["choices"][0]["message"]["content"]
+            parsed = json.loads(content)
             self.circuit.record_success()
             return parsed
         except Exception:
@@ -114,13 +254,77 @@ class LLMClient:
             self.circuit.record_failure()
             raise
 
-    @retry(stop=stop_after_attempt(settings.llm_max_retries), wait=wait_exponential())
-    async def _post(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
-        response = await self._client.post(
-            f"{self.base_url}{path}", json=payload, headers=self._headers()
-        )
+    @retry(
+        stop=stop_any(stop_after_attempt(settings.llm_max_retries), _out_of_budget),
+        wait=_retry_wait,
+        retry=retry_if_not_exception_type(DeadlineExceeded),
+        retry_error_callback=_retry_exhausted,
+    )
+    async def _post(
+        self, path: str, payload: dict[str, Any], call_type: str, tokens: int
+    ) -> dict[str, Any]:
+        check_deadline(f"LLM {call_type} call")
+        limiter = self._rate_limiters[call_type]
+        # Rate-limit tokens come first so a caller sleeping on the bucket never holds a lane slot.
+        waited = await limiter.acquire(tokens)
+        llm_rate_limit_wait.labels(type=call_type).observe(waited)
+        async with self._slot():
+            return await self._send(path, payload, call_type, tokens, limiter)
+
+    async def _send(
+        self,
+        path: str,
+        payload: dict[str, Any],
+        call_type: str,
+        tokens: int,
+        limiter: RateLimiter,
+    ) -> dict[str, Any]:
+        started = time.perf_counter()
+        connection_acquired = False
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal connection_acquired
+            if connection_acquired:
+                return
+            if event_name.endswith(("connect_tcp.started", "send_request_headers.started")):
+                connection_acquired = True
+                llm_http_pool_wait.observe(time.perf_counter() - started)
+
+        try:
+            response = await self._client.post(
+                f"{self.base_url}{path}",
+                json=payload,
+                headers=self._headers(),
+                timeout=httpx.Timeout(
+                    bounded(self.timeout), pool=bounded(settings.llm_http_pool_timeout_s)
+                ),
+                extensions={"trace": trace},
+            )
+        finally:
+            self._observe_pool()
+        limiter.update_from_headers(response.headers)
+        if response.status_code == 429:
+            llm_rate_limited.labels(type=call_type).inc()
+            limiter.backoff(_retry_after(response.headers))
         response.raise_for_status()
-        return response.json()
+        body = response.json()
+        usage = body.get("usage") or {}
+        record_llm(time.perf_counter() - started, usage.get("total_tokens", tokens))
+        return body
+
+    def _observe_pool(self) -> None:
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        llm_http_pool_connections.labels(state="active").set(len(connections) - idle)
+        llm_http_pool_connections.labels(state="idle").set(idle)
+
+    async def _fake_latency(self, tokens: int) -> None:
+        delay_ms = settings.fake_llm_latency_ms + random.uniform(0, settings.fake_llm_latency_jitter_ms)
+        if delay_ms <= 0:
+            return
+        await asyncio.sleep(delay_ms / 1000)
+        record_llm(delay_ms / 1000, tokens)
 
     def _fake_embedding(self, text: str) -> List[float]:
         digest = hashlib.sha256(text.encode("utf-8")).digest()
@@ -12,8 +12,15 @@ from memory_mcp.config import settings
 from memory_mcp.policies import dedup_policy
 from memory_mcp.prompts import COMPARE_SYSTEM_PROMPT, SUPERSEDE_REASON_SYSTEM_PROMPT
 from memory_mcp.models import MemoryItem
-from memory_mcp.schemas import MemoryStatus, MemoryType
+from memory_mcp.schemas import MemoryStatus, MemoryType, RetrievalMode
 from memory_mcp.services.llm_client import LLMClient
+from memory_mcp.services.vector_index import (
+    active_filter,
+    nearest,
+    prepare_vector_search,
+    thread_filter,
+)
+from memory_mcp.utils.stages import stage
 
 
 def _text_similarity(statement_a: str, statement_b: str) -> float:
@@ -44,19 +51,15 @@ async def find_candidates(
     thread_id: UUID,
     limit: int = 5,
 ) -> List[tuple[MemoryItem, float]]:
-    distance = MemoryItem.embedding.cosine_distance(embedding)
-    result = await session.execute(
-        select(MemoryItem, distance.label("distance"))
-        .where(
-            MemoryItem.thread_id == thread_id,
-            MemoryItem.type == item_type.value,
-            MemoryItem.status == MemoryStatus.active.value,
-            MemoryItem.embedding.is_not(None),
-        )
-        .order_by(distance)
-        .limit(limit)
-    )
-    return list(result.all())
+    exact = await prepare_vector_search(session, MemoryItem, thread_id, RetrievalMode.fast)
+    filters = [
+        thread_filter(MemoryItem, thread_id),
+        MemoryItem.type == item_type.value,
+        active_filter(MemoryItem),
+        MemoryItem.embedding.is_not(None),
+    ]
+    result = await session.execute(nearest(MemoryItem, embedding, filters, limit, exact))
+    return sorted(result.all(), key=lambda row: row[1])
 
 
 async def keyword_candidates(
@@ -89,10 +92,13 @@ async def upsert_memory_item(
     evidence_turn_ids: List[UUID],
 ) -> Tuple[MemoryItem, str]:
     payload = _apply_importance_heuristics(payload)
-    embeddings = await llm.embed([f"{payload['title']} {payload['statement']}"])
+    with stage("dedup_embed"):
+        embeddings = await llm.embed([f"{payload['title']} {payload['statement']}"])
     embedding = embeddings[0]
-    candidates = await find_candidates(session, embedding, item_type, thread_id)
-    kw_candidates = await keyword_candidates(session, payload["statement"], item_type, thread_id)
+    with stage("dedup_vector"):
+        candidates = await find_candidates(session, embedding, item_type, thread_id)
+    with stage("dedup_keyword"):
+        kw_candidates = await keyword_candidates(session, payload["statement"], item_type, thread_id)
     candidates_map = {c.id: (c, distance) for c, distance in candidates}
     for candidate in kw_candidates:
         candidates_map.setdefault(candidate.id, (candidate, None))
@@ -177,7 +183,8 @@ async def _supersede_reason(llm: LLMClient, old: str, new: str) -> str:
             "content": f"Explain briefly why this statement supersedes the old one. Old: {old} New: {new}",
         },
     ]
-    response = await llm.chat_json(messages)
+    with stage("supersede_reason"):
+        response = await llm.chat_json(messages)
     return response.get("reason", "Updated to match new information.")
 
 
@@ -196,7 +203,8 @@ async def _compare_with_llm(llm: LLMClient, old: str, new: str) -> str:
             "content": f"Old: {old}\nNew: {new}",
         },
     ]
-    response = await llm.chat_json(messages)
+    with stage("dedup_llm_compare"):
+        response = await llm.chat_json(messages)
     return response.get("relation", "different")
 
 
@@ -223,9 +231,10 @@ async def _insert_new(
         evidence_turn_ids=evidence_turn_ids,
         embedding=embedding,
     )
-    session.add(new_item)
-    await session.commit()
-    await session.refresh(new_item)
+    with stage("insert"):
+        session.add(new_item)
+        await session.commit()
+        await session.refresh(new_item)
     return new_item, "inserted"
 
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, List
+from typing import Any, AsyncIterator, List
 from uuid import UUID
 
 from sqlalchemy import func, select
@@ -12,8 +12,16 @@ from memory_mcp.models import MemoryItem, Turn
 from memory_mcp.prompts import RERANK_SYSTEM_PROMPT
 from memory_mcp.schemas import MemoryStatus, RetrievalMode, RetrievalScope
 from memory_mcp.services.llm_client import LLMClient
+from memory_mcp.services.vector_index import (
+    active_filter,
+    nearest,
+    prepare_vector_search,
+    thread_filter,
+)
 from memory_mcp.metrics import retrieval_low_confidence
+from memory_mcp.utils.deadline import has_budget
 from memory_mcp.utils.rrf import rrf_fuse
+from memory_mcp.utils.stages import stage, timed_operation
 from memory_mcp.utils.token_estimator import estimate_tokens
 
 
@@ -34,33 +42,231 @@ async def retrieve_context(
     recency_bias: float,
     explain: bool,
 ) -> dict[str, Any]:
-    vector = (await llm.embed([query]))[0]
-    rankings: List[List[str]] = []
-    candidates: dict[str, dict[str, Any]] = {}
-    rank_maps: list[dict[str, int]] = []
+    with timed_operation("retrieve.context") as timer:
+        result = await _retrieve_context(
+            session,
+            llm,
+            thread_id,
+            query,
+            mode,
+            scope,
+            top_k,
+            token_budget,
+            recency_bias,
+            explain,
+        )
+    if explain:
+        result["debug_scores"]["stages_ms"] = timer.as_ms()
+    return result
+
+
+async def _retrieve_context(
+    session: AsyncSession,
+    llm: LLMClient,
+    thread_id: UUID,
+    query: str,
+    mode: RetrievalMode,
+    scope: RetrievalScope,
+    top_k: int,
+    token_budget: int,
+    recency_bias: float,
+    explain: bool,
+) -> dict[str, Any]:
+    with stage("embed"):
+        vector = (await llm.embed([query]))[0]
+    ranked_lists: List[List[dict[str, Any]]] = []
+    if scope in (RetrievalScope.distilled_only, RetrievalScope.hybrid):
+        ranked_lists += await _memory_rankings(
+            session, thread_id, vector, query, mode, top_k, recency_bias
+        )
+    degraded: List[str] = []
+    if _wants_turns(mode, scope):
+        if has_budget(settings.retrieval_turns_min_budget_s):
+            ranked_lists += await _turn_rankings(
+                session, thread_id, vector, query, mode, top_k, recency_bias
+            )
+        else:
+            degraded.append("turns")
+
+    with stage("fuse"):
+        sorted_items = _fuse(ranked_lists, explain)
+        chunks, total_tokens = _pack(sorted_items, token_budget, 0, explain)
+
+    low_confidence = len(chunks) < max(2, top_k // 4)
+    if low_confidence:
+        retrieval_low_confidence.inc()
+        if _wants_rerank(mode):
+            if has_budget(settings.retrieval_rerank_min_budget_s):
+                chunks = await _rerank_with_llm(llm, query, chunks)
+            else:
+                degraded.append("rerank")
+    debug_scores = {"count": len(chunks), "total_candidates": len(sorted_items)}
+    if degraded:
+        debug_scores["degraded"] = degraded
+    stale_refs = await _stale_reference_notes(session, thread_id, query)
+    return {
+        "chunks": chunks,
+        "est_tokens": total_tokens,
+        "low_confidence": low_confidence,
+        "debug_scores": debug_scores,
+        "stale_references": stale_refs,
+    }
+
+
+async def stream_retrieve_context(
+    session: AsyncSession,
+    llm: LLMClient,
+    thread_id: UUID,
+    query: str,
+    mode: RetrievalMode,
+    scope: RetrievalScope,
+    top_k: int,
+    token_budget: int,
+    recency_bias: float,
+    explain: bool,
+) -> AsyncIterator[dict[str, Any]]:
+    with timed_operation("retrieve.context") as timer:
+        async for event in _stream_retrieve_context(
+            session,
+            llm,
+            thread_id,
+            query,
+            mode,
+            scope,
+            top_k,
+            token_budget,
+            recency_bias,
+            explain,
+        ):
+            if explain and event["event"] == "done":
+                event["result"]["debug_scores"]["stages_ms"] = timer.as_ms()
+            yield event
+
+
+async def _stream_retrieve_context(
+    session: AsyncSession,
+    llm: LLMClient,
+    thread_id: UUID,
+    query: str,
+    mode: RetrievalMode,
+    scope: RetrievalScope,
+    top_k: int,
+    token_budget: int,
+    recency_bias: float,
+    explain: bool,
+) -> AsyncIterator[dict[str, Any]]:
+    with stage("embed"):
+        vector = (await llm.embed([query]))[0]
+    chunks: List[dict[str, Any]] = []
+    total_tokens = 0
+    total_candidates = 0
+    degraded: List[str] = []
 
     if scope in (RetrievalScope.distilled_only, RetrievalScope.hybrid):
-        memory_vector = await _vector_memory(session, thread_id, vector, top_k, recency_bias)
+        ranked_lists = await _memory_rankings(
+            session, thread_id, vector, query, mode, top_k, recency_bias
+        )
+        with stage("fuse"):
+            sorted_items = _fuse(ranked_lists, explain)
+            memory_chunks, total_tokens = _pack(sorted_items, token_budget, total_tokens, explain)
+        total_candidates += len(sorted_items)
+        chunks += memory_chunks
+        yield {"event": "chunks", "source": "memory", "chunks": memory_chunks, "est_tokens": total_tokens}
+
+    if _wants_turns(mode, scope):
+        if has_budget(settings.retrieval_turns_min_budget_s):
+            ranked_lists = await _turn_rankings(
+                session, thread_id, vector, query, mode, top_k, recency_bias
+            )
+            with stage("fuse"):
+                sorted_items = _fuse(ranked_lists, explain)
+                turn_chunks, total_tokens = _pack(sorted_items, token_budget, total_tokens, explain)
+            total_candidates += len(sorted_items)
+            chunks += turn_chunks
+            yield {
+                "event": "chunks",
+                "source": "turn",
+                "chunks": turn_chunks,
+                "est_tokens": total_tokens,
+            }
+        else:
+            degraded.append("turns")
+
+    low_confidence = len(chunks) < max(2, top_k // 4)
+    if low_confidence:
+        retrieval_low_confidence.inc()
+        if _wants_rerank(mode):
+            if has_budget(settings.retrieval_rerank_min_budget_s):
+                chunks = await _rerank_with_llm(llm, query, chunks)
+                yield {"event": "rerank", "item_ids": [chunk["item_id"] for chunk in chunks]}
+            else:
+                degraded.append("rerank")
+    debug_scores = {"count": len(chunks), "total_candidates": total_candidates}
+    if degraded:
+        debug_scores["degraded"] = degraded
+    stale_refs = await _stale_reference_notes(session, thread_id, query)
+    yield {
+        "event": "done",
+        "result": {
+            "chunks": chunks,
+            "est_tokens": total_tokens,
+            "low_confidence": low_confidence,
+            "debug_scores": debug_scores,
+            "stale_references": stale_refs,
+        },
+    }
+
+
+def _wants_turns(mode: RetrievalMode, scope: RetrievalScope) -> bool:
+    return scope in (RetrievalScope.raw_only, RetrievalScope.hybrid) and mode == RetrievalMode.deep
+
+
+def _wants_rerank(mode: RetrievalMode) -> bool:
+    return settings.enable_llm_rerank and mode == RetrievalMode.deep
+
+
+async def _memory_rankings(
+    session: AsyncSession,
+    thread_id: UUID,
+    vector: List[float],
+    query: str,
+    mode: RetrievalMode,
+    top_k: int,
+    recency_bias: float,
+) -> List[List[dict[str, Any]]]:
+    with stage("memory_vector"):
+        memory_vector = await _vector_memory(session, thread_id, vector, mode, top_k, recency_bias)
+    with stage("memory_keyword"):
         memory_keyword = await _keyword_memory(session, thread_id, query, top_k)
-        memory_vector_ids = [item["id"] for item in memory_vector]
-        memory_keyword_ids = [item["id"] for item in memory_keyword]
-        rankings.append(memory_vector_ids)
-        rankings.append(memory_keyword_ids)
-        rank_maps.append({item_id: rank for rank, item_id in enumerate(memory_vector_ids, start=1)})
-        rank_maps.append({item_id: rank for rank, item_id in enumerate(memory_keyword_ids, start=1)})
-        for item in memory_vector + memory_keyword:
-            candidates[item["id"]] = item
+    return [memory_vector, memory_keyword]
+
 
-    if scope in (RetrievalScope.raw_only, RetrievalScope.hybrid) and mode == RetrievalMode.deep:
-        turn_vector = await _vector_turns(session, thread_id, vector, top_k, recency_bias)
+async def _turn_rankings(
+    session: AsyncSession,
+    thread_id: UUID,
+    vector: List[float],
+    query: str,
+    mode: RetrievalMode,
+    top_k: int,
+    recency_bias: float,
+) -> List[List[dict[str, Any]]]:
+    with stage("turn_vector"):
+        turn_vector = await _vector_turns(session, thread_id, vector, mode, top_k, recency_bias)
+    with stage("turn_keyword"):
         turn_keyword = await _keyword_turns(session, thread_id, query, top_k)
-        turn_vector_ids = [item["id"] for item in turn_vector]
-        turn_keyword_ids = [item["id"] for item in turn_keyword]
-        rankings.append(turn_vector_ids)
-        rankings.append(turn_keyword_ids)
-        rank_maps.append({item_id: rank for rank, item_id in enumerate(turn_vector_ids, start=1)})
-        rank_maps.append({item_id: rank for rank, item_id in enumerate(turn_keyword_ids, start=1)})
-        for item in turn_vector + turn_keyword:
+    return [turn_vector, turn_keyword]
+
+
+def _fuse(ranked_lists: List[List[dict[str, Any]]], explain: bool) -> List[dict[str, Any]]:
+    rankings: List[List[str]] = []
+    candidates: dict[str, dict[str, Any]] = {}
+    rank_maps: list[dict[str, int]] = []
+    for ranked in ranked_lists:
+        ids = [item["id"] for item in ranked]
+        rankings.append(ids)
+        rank_maps.append({item_id: rank for rank, item_id in enumerate(ids, start=1)})
+    for ranked in ranked_lists:
+        for item in ranked:
             candidates[item["id"]] = item
 
     fused = rrf_fuse(rankings)
@@ -72,12 +278,14 @@ async def retrieve_context(
                 "ranks": [rank_map.get(item_id) for rank_map in rank_maps],
             }
 
-    sorted_items = sorted(
-        candidates.values(), key=lambda item: item["score"], reverse=True
-    )
+    return sorted(candidates.values(), key=lambda item: item["score"], reverse=True)
+
 
+def _pack(
+    sorted_items: List[dict[str, Any]], token_budget: int, used_tokens: int, explain: bool
+) -> tuple[List[dict[str, Any]], int]:
     chunks = []
-    total_tokens = 0
+    total_tokens = used_tokens
     for item in sorted_items:
         text = item["text"]
         est = estimate_tokens(text)
@@ -93,43 +301,27 @@ async def retrieve_context(
                 "score_detail": item.get("score_detail") if explain else None,
             }
         )
-
-    low_confidence = len(chunks) < max(2, top_k // 4)
-    if low_confidence:
-        retrieval_low_confidence.inc()
-        if settings.enable_llm_rerank and mode == RetrievalMode.deep:
-            chunks = await _rerank_with_llm(llm, query, chunks)
-    debug_scores = {"count": len(chunks), "total_candidates": len(sorted_items)}
-    stale_refs = await _stale_reference_notes(session, thread_id, query)
-    return {
-        "chunks": chunks,
-        "est_tokens": total_tokens,
-        "low_confidence": low_confidence,
-        "debug_scores": debug_scores,
-        "stale_references": stale_refs,
-    }
+    return chunks, total_tokens
 
 
 async def _vector_memory(
     session: AsyncSession,
     thread_id: UUID,
     vector: List[float],
+    mode: RetrievalMode,
     top_k: int,
     recency_bias: float,
 ) -> List[dict[str, Any]]:
-    distance = MemoryItem.embedding.cosine_distance(vector)
-    result = await session.execute(
-        select(MemoryItem, distance.label("distance"))
-        .where(
-            MemoryItem.thread_id == thread_id,
-            MemoryItem.status == MemoryStatus.active.value,
-            MemoryItem.embedding.is_not(None),
-        )
-        .order_by(distance)
-        .limit(top_k)
-    )
+    exact = await prepare_vector_search(session, MemoryItem, thread_id, mode)
+    filters = [
+        thread_filter(MemoryItem, thread_id),
+        active_filter(MemoryItem),
+        MemoryItem.embedding.is_not(None),
+    ]
+    result = await session.execute(nearest(MemoryItem, vector, filters, top_k, exact))
     items = []
-    for item, dist in result.all():
+    # Iterative index scans in relaxed_order mode may return rows slightly out of order.
+    for item, dist in sorted(result.all(), key=lambda row: row[1]):
         score = (1 - dist) * item.importance
         score *= _recency_weight(item.updated_at, recency_bias)
         items.append(
@@ -171,21 +363,15 @@ async def _vector_turns(
     session: AsyncSession,
     thread_id: UUID,
     vector: List[float],
+    mode: RetrievalMode,
     top_k: int,
     recency_bias: float,
 ) -> List[dict[str, Any]]:
-    distance = Turn.embedding.cosine_distance(vector)
-    result = await session.execute(
-        select(Turn, distance.label("distance"))
-        .where(
-            Turn.thread_id == thread_id,
-            Turn.embedding.is_not(None),
-        )
-        .order_by(distance)
-        .limit(top_k)
-    )
+    exact = await prepare_vector_search(session, Turn, thread_id, mode)
+    filters = [Turn.thread_id == thread_id, Turn.embedding.is_not(None)]
+    result = await session.execute(nearest(Turn, vector, filters, top_k, exact))
     items = []
-    for item, dist in result.all():
+    for item, dist in sorted(result.all(), key=lambda row: row[1]):
         score = (1 - dist) * _recency_weight(item.ts, recency_bias)
         items.append(
             {
@@ -227,7 +413,8 @@ async def _stale_reference_notes(
 ) -> List[str]:
     from memory_mcp.services.stale import find_stale_references
 
-    return await find_stale_references(session, thread_id, query_text, limit=5)
+    with stage("stale_refs"):
+        return await find_stale_references(session, thread_id, query_text, limit=5)
 
 
 async def _rerank_with_llm(
@@ -247,7 +434,8 @@ async def _rerank_with_llm(
             "content": f"Pick the best 8 chunks for query '{query}'. Return JSON list of ids. Chunks: {snippet}",
         },
     ]
-    response = await llm.chat_json(messages)
+    with stage("rerank"):
+        response = await llm.chat_json(messages)
     ordered_ids = response.get("ids", [])
     if not ordered_ids:
         return chunks
@@ -1,64 +1,444 @@
 from __future__ import annotations
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
+from sqlalchemy import Select, cast, func, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from memory_mcp.config import settings
+from memory_mcp.metrics import vector_index_build_progress, vector_index_builds
+from memory_mcp.schemas import MemoryStatus, RetrievalMode
+from memory_mcp.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+ITERATIVE_SCAN_MIN_VERSION = (0, 8, 0)
+ITERATIVE_SCAN_MODES = ("off", "strict_order", "relaxed_order")
+HOT_THREAD_INDEX_PREFIX = "ix_mem_thread_"
+LEGACY_HOT_THREAD_INDEX_PREFIX = "ix_memory_embedding_thread_"
+MANAGED_INDEX_PREFIXES = ("ix_turns_embedding_", "ix_memory_embedding_", HOT_THREAD_INDEX_PREFIX)
+QUANTIZATIONS = ("none", "halfvec", "binary")
+BUILD_LOCK_KEY = 0x6D656D76
+BUILD_START_PHASES = ("initializing", "waiting for writers before build")
+BUILD_BUILT_RATIO = 0.9
+
+_thread_sizes = LRUCache(10_000, settings.vector_thread_size_cache_ttl_s)
+_pgvector_version: tuple[int, ...] | None = None
+_hot_threads: set[UUID] = set()
+build_errors: dict[str, str] = {}
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    name: str
+    table: str
+    definition: str
+    slot: str
 
 
 async def ensure_vector_indexes(engine: AsyncEngine) -> None:
-    async with engine.begin() as conn:
-        index_type = settings.vector_index_type.lower()
-        if index_type == "auto":
-            index_type = await _detect_vector_index(conn)
-        if index_type == "hnsw":
-            await conn.execute(
-                text(
-                    "CREATE INDEX IF NOT EXISTS ix_turns_embedding_hnsw "
-                    "ON turns USING hnsw (embedding vector_cosine_ops) "
-                    "WITH (m = :m, ef_construction = :ef)"
-                ),
-                {"m": settings.vector_hnsw_m, "ef": settings.vector_hnsw_ef_construction},
-            )
-            await conn.execute(
-                text(
-                    "CREATE INDEX IF NOT EXISTS ix_memory_embedding_hnsw "
-                    "ON memory_items USING hnsw (embedding vector_cosine_ops) "
-                    "WITH (m = :m, ef_construction = :ef)"
-                ),
-                {"m": settings.vector_hnsw_m, "ef": settings.vector_hnsw_ef_construction},
-            )
-        else:
-            await conn.execute(
-                text(
-                    "CREATE INDEX IF NOT EXISTS ix_turns_embedding_ivfflat "
-                    "ON turns USING ivfflat (embedding vector_cosine_ops) "
-                    "WITH (lists = :lists)"
-                ),
-                {"lists": settings.vector_ivfflat_lists},
-            )
-            await conn.execute(
-                text(
-                    "CREATE INDEX IF NOT EXISTS ix_memory_embedding_ivfflat "
-                    "ON memory_items USING ivfflat (embedding vector_cosine_ops) "
-                    "WITH (lists = :lists)"
-                ),
-                {"lists": settings.vector_ivfflat_lists},
-            )
+    async with engine.connect() as pooled:
+        # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+        conn = await pooled.execution_options(isolation_level="AUTOCOMMIT")
+        locked = (
+            await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": BUILD_LOCK_KEY})
+        ).scalar_one()
+        if not locked:
+            # Wait for the running build; the pass below then finds valid indexes and
+            # only loads the hot-thread set the other process created.
+            logger.info("Vector index build is running in another process, waiting")
+            await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": BUILD_LOCK_KEY})
+        try:
+            index_type = settings.vector_index_type.lower()
+            if index_type == "auto":
+                index_type = await _detect_vector_index(conn)
+            method, options = _index_options(index_type)
+            target = index_target(_quantization(), settings.embedding_dim)
+            specs = index_specs(method, target, options, await _hot_threads_wanted(conn))
+            ready = set()
+            for spec in specs:
+                if await _build_index(engine, conn, spec):
+                    ready.add(spec.slot)
+            # Indexes for another method, quantization or no-longer-hot thread are dead weight,
+            # but only once a valid replacement exists; otherwise searches lose their ANN index.
+            for name in stale_indexes(await _managed_indexes(conn), specs, ready):
+                logger.info("Dropping stale vector index %s", name)
+                await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            await _load_hot_threads(conn)
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BUILD_LOCK_KEY})
 
 
-async def _detect_vector_index(conn) -> str:
+def index_suffix(method: str) -> str:
+    quantization = _quantization()
+    return method if quantization == "none" else f"{method}_{quantization}"
+
+
+def index_specs(method: str, target: str, options: str, hot_threads: set[UUID]) -> list[IndexSpec]:
+    suffix = index_suffix(method)
+    active = f"status = '{MemoryStatus.active.value}'"
+    specs = [
+        IndexSpec(
+            f"ix_turns_embedding_{suffix}",
+            "turns",
+            f"USING {method} {target} WITH ({options})",
+            "turns",
+        ),
+        IndexSpec(
+            f"ix_memory_embedding_active_{suffix}",
+            "memory_items",
+            f"USING {method} {target} WITH ({options}) WHERE {active}",
+            "memory",
+        ),
+    ]
+    specs += [
+        IndexSpec(
+            hot_thread_index_name(thread_id, suffix),
+            "memory_items",
+            f"USING {method} {target} WITH ({options}) WHERE {active} AND thread_id = '{thread_id}'",
+            f"thread:{thread_id.hex}",
+        )
+        for thread_id in sorted(hot_threads)
+    ]
+    return specs
+
+
+def stale_indexes(existing: set[str], specs: list[IndexSpec], ready: set[str]) -> set[str]:
+    slots = {spec.slot for spec in specs}
+
+    def replaced_by(name: str) -> str:
+        if name.startswith("ix_turns_embedding_"):
+            return "turns"
+        if name.startswith((HOT_THREAD_INDEX_PREFIX, LEGACY_HOT_THREAD_INDEX_PREFIX)):
+            slot = f"thread:{name.rsplit('_', 1)[1]}"
+            if slot in slots:
+                return slot
+        # Legacy names and no-longer-hot threads fall back to the active partial index.
+        return "memory"
+
+    stale = existing - {spec.name for spec in specs}
+    kept = {name for name in stale if replaced_by(name) not in ready}
+    for name in sorted(kept):
+        logger.warning("Keeping stale vector index %s until its replacement builds", name)
+    return stale - kept
+
+
+async def _build_index(engine: AsyncEngine, conn, spec: IndexSpec) -> bool:
+    valid = await _index_valid(conn, spec.name)
+    if valid:
+        vector_index_build_progress.labels(index=spec.name).set(1.0)
+        return True
+    if valid is not None:
+        # An interrupted concurrent build leaves an INVALID index that IF NOT EXISTS would keep.
+        logger.warning("Dropping invalid vector index %s before rebuilding", spec.name)
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {spec.name}"))
+    pid = (await conn.execute(text("SELECT pg_backend_pid()"))).scalar_one()
+    watcher = asyncio.create_task(_watch_progress(engine, spec.name, pid))
+    started = time.perf_counter()
     try:
-        result = await conn.execute(text("SHOW server_version_num"))
-        _ = result.scalar_one()
         await conn.execute(
-            text(
-                "SELECT 1 FROM pg_am WHERE amname = 'hnsw'"
-            )
+            text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {spec.name} ON {spec.table} {spec.definition}")
         )
+    except Exception as exc:
+        vector_index_builds.labels(outcome="failed").inc()
+        build_errors[spec.name] = str(exc)
+        logger.exception("Vector index build failed", extra={"index": spec.name})
+        return False
+    finally:
+        watcher.cancel()
+        # Let the watcher finish so its last gauge update cannot land after the outcome.
+        # asyncio.wait never raises the watcher's error and still propagates our own cancellation.
+        await asyncio.wait([watcher])
+        if not watcher.cancelled() and watcher.exception() is not None:
+            logger.warning("Vector index progress watcher failed", exc_info=watcher.exception())
+    build_errors.pop(spec.name, None)
+    vector_index_builds.labels(outcome="ok").inc()
+    vector_index_build_progress.labels(index=spec.name).set(1.0)
+    logger.info(
+        "Vector index built",
+        extra={"index": spec.name, "duration_s": round(time.perf_counter() - started, 3)},
+    )
+    return True
+
+
+async def _watch_progress(engine: AsyncEngine, name: str, pid: int) -> None:
+    async with engine.connect() as conn:
+        while True:
+            row = (
+                await conn.execute(
+                    text(
+                        "SELECT phase, blocks_total, blocks_done, tuples_total, tuples_done "
+                        "FROM pg_stat_progress_create_index WHERE pid = :pid"
+                    ),
+                    {"pid": pid},
+                )
+            ).first()
+            await conn.rollback()
+            if row is not None:
+                vector_index_build_progress.labels(index=name).set(progress_ratio(*row))
+            await asyncio.sleep(settings.vector_index_progress_interval_s)
+
+
+def progress_ratio(
+    phase: str, blocks_total: int, blocks_done: int, tuples_total: int, tuples_done: int
+) -> float:
+    if not phase.startswith("building index"):
+        # CONCURRENTLY waits for writers first, then validates and waits for old snapshots.
+        return 0.0 if phase in BUILD_START_PHASES else BUILD_BUILT_RATIO
+    # HNSW and IVFFlat finish the table scan before loading tuples into the graph or lists,
+    # so a complete scan is only half of the build; 1.0 is reserved for a finished index.
+    scanned = min(1.0, blocks_done / blocks_total) if blocks_total else 0.0
+    loaded = min(1.0, tuples_done / tuples_total) if tuples_total else 0.0
+    if not blocks_total:
+        return BUILD_BUILT_RATIO * loaded
+    return BUILD_BUILT_RATIO * (scanned + loaded) / 2
+
+
+async def _index_valid(conn, name: str) -> bool | None:
+    result = await conn.execute(
+        text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name"
+        ),
+        {"name": name},
+    )
+    return result.scalar_one_or_none()
+
+
+def _index_options(index_type: str) -> tuple[str, str]:
+    # Index storage parameters cannot be bind parameters, so they are inlined as ints.
+    if index_type == "hnsw":
+        return (
+            "hnsw",
+            f"m = {int(settings.vector_hnsw_m)}, "
+            f"ef_construction = {int(settings.vector_hnsw_ef_construction)}",
+        )
+    return "ivfflat", f"lists = {int(settings.vector_ivfflat_lists)}"
+
+
+def _quantization() -> str:
+    if settings.vector_quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown VECTOR_QUANTIZATION {settings.vector_quantization}")
+    return settings.vector_quantization
+
+
+def index_target(quantization: str, dim: int) -> str:
+    if quantization == "halfvec":
+        return f"((embedding::halfvec({int(dim)})) halfvec_cosine_ops)"
+    if quantization == "binary":
+        return f"((binary_quantize(embedding)::bit({int(dim)})) bit_hamming_ops)"
+    return "(embedding vector_cosine_ops)"
+
+
+def hot_thread_index_name(thread_id: UUID, suffix: str) -> str:
+    return f"{HOT_THREAD_INDEX_PREFIX}{suffix}_{thread_id.hex}"
+
+
+async def _hot_threads_wanted(conn) -> set[UUID]:
+    if settings.vector_hot_thread_indexes <= 0:
+        return set()
+    result = await conn.execute(
+        text(
+            "SELECT thread_id FROM memory_items WHERE status = :status "
+            "GROUP BY thread_id HAVING count(*) >= :min_rows "
+            "ORDER BY count(*) DESC LIMIT :limit"
+        ),
+        {
+            "status": MemoryStatus.active.value,
+            "min_rows": settings.vector_hot_thread_min_rows,
+            "limit": settings.vector_hot_thread_indexes,
+        },
+    )
+    return {row[0] for row in result}
+
+
+async def _managed_indexes(conn) -> set[str]:
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "JOIN pg_class t ON t.oid = i.indrelid "
+            "JOIN pg_am am ON am.oid = c.relam "
+            "WHERE t.relname IN ('turns', 'memory_items') AND am.amname IN ('hnsw', 'ivfflat')"
+        )
+    )
+    return {row[0] for row in result if row[0].startswith(MANAGED_INDEX_PREFIXES)}
+
+
+async def _load_hot_threads(conn) -> None:
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE starts_with(c.relname, :prefix) AND i.indisvalid"
+        ),
+        {"prefix": HOT_THREAD_INDEX_PREFIX},
+    )
+    _hot_threads.clear()
+    _hot_threads.update(UUID(row[0].rsplit("_", 1)[1]) for row in result)
+
+
+async def index_status(session: AsyncSession) -> dict[str, Any]:
+    indexes = await session.execute(
+        text(
+            "SELECT c.relname, t.relname, am.amname, i.indisvalid, pg_relation_size(c.oid) "
+            "FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "JOIN pg_class t ON t.oid = i.indrelid "
+            "JOIN pg_am am ON am.oid = c.relam "
+            "WHERE t.relname IN ('turns', 'memory_items') AND am.amname IN ('hnsw', 'ivfflat') "
+            "ORDER BY c.relname"
+        )
+    )
+    builds = await session.execute(
+        text(
+            "SELECT p.pid, t.relname, c.relname, p.phase, "
+            "p.blocks_total, p.blocks_done, p.tuples_total, p.tuples_done "
+            "FROM pg_stat_progress_create_index p "
+            "JOIN pg_class t ON t.oid = p.relid "
+            "LEFT JOIN pg_class c ON c.oid = p.index_relid "
+            "WHERE t.relname IN ('turns', 'memory_items')"
+        )
+    )
+    return {
+        "indexes": [
+            {"name": name, "table": table, "method": method, "valid": valid, "size_bytes": size}
+            for name, table, method, valid, size in indexes.all()
+        ],
+        "builds": [
+            {
+                "pid": pid,
+                "table": table,
+                "index": name,
+                "phase": phase,
+                "progress": round(progress_ratio(phase, *counters), 4),
+            }
+            for pid, table, name, phase, *counters in builds.all()
+        ],
+        "errors": dict(build_errors),
+        "hot_threads": sorted(str(thread_id) for thread_id in _hot_threads),
+    }
+
+
+def active_filter(model: Any) -> Any:
+    # A literal predicate lets the planner match the partial index under generic plans too.
+    return model.status == literal_column(f"'{MemoryStatus.active.value}'")
+
+
+def thread_filter(model: Any, thread_id: UUID) -> Any:
+    if thread_id in _hot_threads:
+        return model.thread_id == literal_column(f"'{thread_id}'::uuid")
+    return model.thread_id == thread_id
+
+
+async def _detect_vector_index(conn) -> str:
+    try:
         result = await conn.execute(text("SELECT 1 FROM pg_am WHERE amname = 'hnsw'"))
-        if result.scalar_one_or_none():
-            return "hnsw"
     except Exception:
         return "ivfflat"
-    return "ivfflat"
+    return "hnsw" if result.scalar_one_or_none() else "ivfflat"
+
+
+async def pgvector_version(session: AsyncSession) -> tuple[int, ...]:
+    global _pgvector_version
+    if _pgvector_version is None:
+        result = await session.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )
+        _pgvector_version = parse_version(result.scalar_one_or_none() or "0")
+    return _pgvector_version
+
+
+def parse_version(value: str) -> tuple[int, ...]:
+    parts = []
+    for part in value.split("."):
+        digits = "".join(char for char in part if char.isdigit())
+        parts.append(int(digits or 0))
+    return tuple(parts)
+
+
+def search_settings(mode: RetrievalMode, version: tuple[int, ...]) -> dict[str, str]:
+    if settings.vector_iterative_scan not in ITERATIVE_SCAN_MODES:
+        raise ValueError(f"Unknown VECTOR_ITERATIVE_SCAN {settings.vector_iterative_scan}")
+    values = {
+        "hnsw.ef_search": str(settings.vector_hnsw_ef_search[mode.value]),
+        "ivfflat.probes": str(settings.vector_ivfflat_probes[mode.value]),
+    }
+    if version >= ITERATIVE_SCAN_MIN_VERSION:
+        values["hnsw.iterative_scan"] = settings.vector_iterative_scan
+        # IVFFlat has no strict ordering mode.
+        values["ivfflat.iterative_scan"] = (
+            "off" if settings.vector_iterative_scan == "off" else "relaxed_order"
+        )
+    return values
+
+
+async def thread_size(session: AsyncSession, model: Any, thread_id: UUID) -> int:
+    key = f"{model.__tablename__}:{thread_id}"
+    cached = _thread_sizes.get(key)
+    if cached is not None:
+        return cached
+    result = await session.execute(
+        select(func.count()).select_from(model).where(model.thread_id == thread_id)
+    )
+    size = result.scalar_one()
+    _thread_sizes.set(key, size)
+    return size
+
+
+async def prepare_vector_search(
+    session: AsyncSession, model: Any, thread_id: UUID, mode: RetrievalMode
+) -> bool:
+    if await thread_size(session, model, thread_id) <= settings.vector_exact_search_max_rows:
+        return True
+    values = search_settings(mode, await pgvector_version(session))
+    await session.execute(
+        select(*[func.set_config(name, value, True) for name, value in values.items()])
+    )
+    return False
+
+
+def distance_order(distance: Any, exact: bool) -> Any:
+    # "+ 0" hides the distance operator from the planner, so small threads use
+    # the thread_id btree index and an exact sort instead of the global ANN index.
+    return distance + 0 if exact else distance
+
+
+def quantized_distance(model: Any, vector: list[float], quantization: str) -> Any:
+    dim = settings.embedding_dim
+    query = cast(vector, Vector(dim))
+    if quantization == "halfvec":
+        return cast(model.embedding, HALFVEC(dim)).cosine_distance(cast(query, HALFVEC(dim)))
+    return cast(func.binary_quantize(model.embedding), BIT(dim)).hamming_distance(
+        cast(func.binary_quantize(query), BIT(dim))
+    )
+
+
+def nearest(model: Any, vector: list[float], filters: list[Any], limit: int, exact: bool) -> Select:
+    distance = model.embedding.cosine_distance(vector)
+    quantization = _quantization()
+    if exact or quantization == "none":
+        return (
+            select(model, distance.label("distance"))
+            .where(*filters)
+            .order_by(distance_order(distance, exact))
+            .limit(limit)
+        )
+    candidates = (
+        select(model.id)
+        .where(*filters)
+        .order_by(quantized_distance(model, vector, quantization))
+        .limit(limit * settings.vector_rerank_factor)
+    )
+    # The compact index only shortlists; the final order uses full-precision vectors.
+    return (
+        select(model, distance.label("distance"))
+        .where(model.id.in_(candidates))
+        .order_by(distance_order(distance, True))
+        .limit(limit)
+    )
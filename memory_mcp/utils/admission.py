@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, name: str, retry_after_s: int) -> None:
+        super().__init__(f"{name} is saturated, retry after {retry_after_s}s")
+        self.name = name
+        self.retry_after_s = retry_after_s
+
+
+class ToolLimiter:
+    def __init__(self, name: str, max_concurrency: int, max_queue: int) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self.avg_hold_s = 1.0
+        self._queue: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def retry_after(self) -> int:
+        waves = (self.queued + 1) / max(1, self.max_concurrency)
+        return max(1, math.ceil(waves * self.avg_hold_s))
+
+    def check(self) -> None:
+        if self.active >= self.max_concurrency and self.queued >= self.max_queue:
+            raise AdmissionRejected(self.name, self.retry_after())
+
+    async def acquire(self) -> None:
+        if self.active < self.max_concurrency and not self._queue:
+            self.active += 1
+            return
+        self.check()
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queue.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            elif waiter in self._queue:
+                # release may already have popped and skipped the cancelled waiter.
+                self._queue.remove(waiter)
+            raise
+
+    def release(self, held_s: float | None = None) -> None:
+        if held_s is not None:
+            self.avg_hold_s = 0.8 * self.avg_hold_s + 0.2 * held_s
+        self.active -= 1
+        while self._queue and self.active < self.max_concurrency:
+            waiter = self._queue.popleft()
+            if waiter.done():
+                continue
+            self.active += 1
+            waiter.set_result(None)
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_concurrency: dict[str, int],
+        max_queue: dict[str, int],
+        default_max_concurrency: int = 0,
+        default_max_queue: int = 0,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.default_max_concurrency = default_max_concurrency
+        self.default_max_queue = default_max_queue
+        self._limiters: dict[str, ToolLimiter | None] = {}
+
+    def limiter(self, name: str) -> ToolLimiter | None:
+        if name not in self._limiters:
+            concurrency = self.max_concurrency.get(name, self.default_max_concurrency)
+            queue = self.max_queue.get(name, self.default_max_queue)
+            self._limiters[name] = ToolLimiter(name, concurrency, queue) if concurrency > 0 else None
+        return self._limiters[name]
+
+    def check(self, name: str) -> None:
+        limiter = self.limiter(name)
+        if limiter is not None:
+            limiter.check()
+
+    @asynccontextmanager
+    async def slot(self, name: str) -> AsyncIterator[float]:
+        limiter = self.limiter(name)
+        started = time.perf_counter()
+        if limiter is None:
+            yield 0.0
+            return
+        await limiter.acquire()
+        admitted = time.perf_counter()
+        try:
+            yield admitted - started
+        finally:
+            limiter.release(time.perf_counter() - admitted)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {
+            name: {"active": limiter.active, "queued": limiter.queued}
+            for name, limiter in self._limiters.items()
+            if limiter is not None
+        }
@@ -1,30 +1,93 @@
 from __future__ import annotations
 
+import sys
+import threading
 import time
+from array import array
+from collections import OrderedDict
 from typing import Any
 
+_ARRAY_OVERHEAD_BYTES = sys.getsizeof(array("f"))
+
+
+def _pack(value: Any) -> tuple[Any, int]:
+    if isinstance(value, list) and value and isinstance(value[0], float):
+        packed = array("f", value)
+        return packed, _ARRAY_OVERHEAD_BYTES + packed.itemsize * len(packed)
+    return value, sys.getsizeof(value)
+
+
+def _unpack(value: Any) -> Any:
+    if isinstance(value, array):
+        return value.tolist()
+    return value
+
 
 class LRUCache:
-    def __init__(self, max_entries: int, ttl_s: int) -> None:
+    def __init__(self, max_entries: int, ttl_s: int, max_bytes: int = 0) -> None:
         self.max_entries = max_entries
         self.ttl_s = ttl_s
-        self._store: dict[str, tuple[float, Any]] = {}
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_used = 0
+        self._store: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._store)
 
     def get(self, key: str) -> Any | None:
-        if key not in self._store:
-            return None
-        timestamp, value = self._store[key]
-        if time.time() - timestamp > self.ttl_s:
-            self._store.pop(key, None)
-            return None
-        self._store.pop(key)
-        self._store[key] = (time.time(), value)
-        return value
+        now = time.monotonic()
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            timestamp, value, size = entry
+            if now - timestamp > self.ttl_s:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._store[key] = (now, value, size)
+            self._store.move_to_end(key)
+            self.hits += 1
+        return _unpack(value)
 
     def set(self, key: str, value: Any) -> None:
-        if key in self._store:
-            self._store.pop(key)
-        elif len(self._store) >= self.max_entries:
-            oldest = next(iter(self._store))
-            self._store.pop(oldest, None)
-        self._store[key] = (time.time(), value)
+        packed, size = _pack(value)
+        size += sys.getsizeof(key)
+        if self.max_bytes and size > self.max_bytes:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if key in self._store:
+                self._remove(key)
+            while self._store and (
+                len(self._store) >= self.max_entries
+                or (self.max_bytes and self.bytes_used + size > self.max_bytes)
+            ):
+                oldest = next(iter(self._store))
+                self._remove(oldest)
+                self.evictions += 1
+            self._store[key] = (now, packed, size)
+            self.bytes_used += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self.bytes_used = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._store),
+            "bytes": self.bytes_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._store.pop(key)
+        self.bytes_used -= size
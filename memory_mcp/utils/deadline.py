@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+current_deadline: ContextVar[float | None] = ContextVar("current_deadline", default=None)
+
+
+@contextmanager
+def use_deadline(timeout_s: float | None) -> Iterator[None]:
+    deadline = current_deadline.get()
+    if timeout_s is not None and timeout_s > 0:
+        candidate = time.monotonic() + timeout_s
+        deadline = candidate if deadline is None else min(deadline, candidate)
+    token = current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        current_deadline.reset(token)
+
+
+def remaining() -> float | None:
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def bounded(timeout_s: float) -> float:
+    budget = remaining()
+    if budget is None:
+        return timeout_s
+    return max(0.0, min(timeout_s, budget))
+
+
+def has_budget(min_s: float) -> bool:
+    budget = remaining()
+    return budget is None or budget >= min_s
+
+
+def check_deadline(stage: str) -> None:
+    budget = remaining()
+    if budget is not None and budget <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {stage}")
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from memory_mcp.metrics import llm_hedged_requests
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    def __init__(
+        self,
+        percentile: float,
+        min_delay_s: float,
+        max_rate: float,
+        window: int,
+        min_samples: int = 20,
+    ) -> None:
+        self.percentile = percentile
+        self.min_delay_s = min_delay_s
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._hedged: deque[bool] = deque(maxlen=window)
+
+    def record_latency(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+
+    def record_request(self, hedged: bool) -> None:
+        self._hedged.append(hedged)
+
+    def delay(self) -> float | None:
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+        return max(self.min_delay_s, ordered[index])
+
+    def allow_hedge(self) -> bool:
+        if not self._hedged:
+            return self.max_rate > 0
+        return sum(self._hedged) / len(self._hedged) < self.max_rate
+
+
+async def hedged_call(call: Callable[[], Awaitable[T]], policy: HedgePolicy) -> T:
+    async def timed() -> T:
+        started = time.perf_counter()
+        result = await call()
+        policy.record_latency(time.perf_counter() - started)
+        return result
+
+    primary = asyncio.ensure_future(timed())
+    delay = policy.delay()
+    if delay is None:
+        policy.record_request(False)
+        return await primary
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+    except asyncio.CancelledError:
+        primary.cancel()
+        raise
+    if done:
+        policy.record_request(False)
+        return primary.result()
+    if not policy.allow_hedge():
+        llm_hedged_requests.labels(outcome="capped").inc()
+        policy.record_request(False)
+        return await primary
+
+    llm_hedged_requests.labels(outcome="sent").inc()
+    policy.record_request(True)
+    hedge = asyncio.ensure_future(timed())
+    pending = {primary, hedge}
+    error: BaseException | None = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                    continue
+                if task is hedge:
+                    llm_hedged_requests.labels(outcome="won").inc()
+                return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+    assert error is not None
+    raise error
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Iterator
+
+
+class Priority(IntEnum):
+    interactive = 0
+    background = 1
+
+
+current_priority: ContextVar[Priority] = ContextVar(
+    "current_priority", default=Priority.interactive
+)
+
+
+@contextmanager
+def use_priority(priority: Priority) -> Iterator[None]:
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class PriorityLimiter:
+    def __init__(self, total: int, lane_limits: dict[Priority, int]) -> None:
+        self.total = total
+        self.lane_limits = lane_limits
+        self.active = {priority: 0 for priority in Priority}
+        self._queues: dict[Priority, deque[asyncio.Future[None]]] = {
+            priority: deque() for priority in Priority
+        }
+
+    def _has_capacity(self, priority: Priority) -> bool:
+        return (
+            sum(self.active.values()) < self.total
+            and self.active[priority] < self.lane_limits.get(priority, self.total)
+        )
+
+    def _queued_ahead(self, priority: Priority) -> bool:
+        return any(
+            self._queues[lane]
+            and (lane == priority or self.active[lane] < self.lane_limits.get(lane, self.total))
+            for lane in Priority
+            if lane <= priority
+        )
+
+    async def acquire(self, priority: Priority) -> None:
+        if self._has_capacity(priority) and not self._queued_ahead(priority):
+            self.active[priority] += 1
+            return
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queues[priority].append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(priority)
+            elif waiter in self._queues[priority]:
+                # _wake may already have popped and skipped the cancelled waiter.
+                self._queues[priority].remove(waiter)
+            raise
+
+    def release(self, priority: Priority) -> None:
+        self.active[priority] -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        for priority in Priority:
+            queue = self._queues[priority]
+            while queue and self._has_capacity(priority):
+                waiter = queue.popleft()
+                if waiter.done():
+                    continue
+                self.active[priority] += 1
+                waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from typing import Mapping
+
+from memory_mcp.utils.deadline import DeadlineExceeded, remaining
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.refill_per_s = per_minute / 60.0
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.level = min(self.capacity, self.level + elapsed * self.refill_per_s)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self.refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_per_s
+
+    def consume(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def resize(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.refill_per_s = per_minute / 60.0
+        self.level = min(self.level, self.capacity)
+
+    def sync(self, remaining: float, now: float) -> None:
+        self.refill(now)
+        self.level = min(self.level, remaining)
+
+
+class RateLimiter:
+    def __init__(self, rpm: int, tpm: int) -> None:
+        self.configured_rpm = rpm
+        self.configured_tpm = tpm
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.blocked_until = 0.0
+
+    async def acquire(self, tokens: int) -> float:
+        waited = 0.0
+        while True:
+            # Check and consume never await, so they are atomic on the event loop and
+            # waiters sleep without holding anything that would serialize the others.
+            delay = self._wait_time(tokens, time.monotonic())
+            if delay <= 0:
+                if self.requests is not None:
+                    self.requests.consume(1)
+                if self.tokens is not None:
+                    self.tokens.consume(tokens)
+                return waited
+            budget = remaining()
+            if budget is not None and delay > budget:
+                raise DeadlineExceeded(f"Rate limit wait of {delay:.3f}s exceeds the deadline")
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        delay = self.blocked_until - now
+        if self.requests is not None:
+            delay = max(delay, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.wait_time(tokens, now))
+        return delay
+
+    def backoff(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        now = time.monotonic()
+        self.requests = self._sync_bucket(
+            self.requests, self.configured_rpm, headers, "requests", now
+        )
+        self.tokens = self._sync_bucket(self.tokens, self.configured_tpm, headers, "tokens", now)
+
+    def _sync_bucket(
+        self,
+        bucket: TokenBucket | None,
+        configured: int,
+        headers: Mapping[str, str],
+        kind: str,
+        now: float,
+    ) -> TokenBucket | None:
+        limit = _header_int(headers, f"x-ratelimit-limit-{kind}")
+        if limit:
+            if configured > 0:
+                limit = min(limit, configured)
+            if bucket is None:
+                bucket = TokenBucket(limit)
+            elif bucket.capacity != limit:
+                bucket.resize(limit)
+        remaining = _header_int(headers, f"x-ratelimit-remaining-{kind}")
+        if bucket is None or remaining is None:
+            return bucket
+        bucket.sync(remaining, now)
+        if remaining <= 0:
+            reset = parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            if reset:
+                self.blocked_until = max(self.blocked_until, now + reset)
+        return bucket
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> int | None:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+
+@dataclass
+class CallMetrics:
+    llm_calls: int = 0
+    llm_time_s: float = 0.0
+    tokens: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+current_request_id: ContextVar[str | None] = ContextVar("current_request_id", default=None)
+current_call: ContextVar[CallMetrics | None] = ContextVar("current_call", default=None)
+
+
+@contextmanager
+def use_request_id(request_id: str | None = None) -> Iterator[str]:
+    value = request_id or current_request_id.get() or uuid.uuid4().hex
+    token = current_request_id.set(value)
+    try:
+        yield value
+    finally:
+        current_request_id.reset(token)
+
+
+@contextmanager
+def track_call() -> Iterator[CallMetrics]:
+    outer = current_call.get()
+    if outer is not None:
+        yield outer
+        return
+    metrics = CallMetrics()
+    token = current_call.set(metrics)
+    try:
+        yield metrics
+    finally:
+        current_call.reset(token)
+
+
+def record_llm(seconds: float, tokens: int) -> None:
+    metrics = current_call.get()
+    if metrics is not None:
+        metrics.llm_calls += 1
+        metrics.llm_time_s += seconds
+        metrics.tokens += tokens
+
+
+def record_cache(hits: int, misses: int) -> None:
+    metrics = current_call.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        owned, _ = self.claim([key])
+        try:
+            result = await fn()
+        except BaseException as exc:
+            self.fail(owned, exc)
+            raise
+        self.resolve(owned, key, result)
+        return result
+
+    def claim(
+        self, keys: Iterable[str]
+    ) -> tuple[dict[str, asyncio.Future[Any]], dict[str, asyncio.Future[Any]]]:
+        loop = asyncio.get_running_loop()
+        owned: dict[str, asyncio.Future[Any]] = {}
+        waiting: dict[str, asyncio.Future[Any]] = {}
+        for key in keys:
+            future = self._calls.get(key)
+            if future is None:
+                future = loop.create_future()
+                future.add_done_callback(_consume_exception)
+                self._calls[key] = future
+                owned[key] = future
+            else:
+                waiting[key] = future
+        return owned, waiting
+
+    def resolve(self, owned: dict[str, asyncio.Future[Any]], key: str, value: Any) -> None:
+        future = owned[key]
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.done():
+            future.set_result(value)
+
+    def fail(self, owned: dict[str, asyncio.Future[Any]], exc: BaseException) -> None:
+        if isinstance(exc, asyncio.CancelledError):
+            exc = RuntimeError("Coalesced request was cancelled")
+        for key, future in owned.items():
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            if not future.done():
+                future.set_exception(exc)
+
+
+def _consume_exception(future: asyncio.Future[Any]) -> None:
+    if not future.cancelled():
+        future.exception()
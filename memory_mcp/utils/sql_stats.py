@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from memory_mcp.config import settings
+from memory_mcp.metrics import sql_commits, sql_duration, sql_repeated_statements, sql_statements
+
+logger = logging.getLogger(__name__)
+
+_MAX_LOGGED_STATEMENT = 2000
+
+
+@dataclass
+class QueryStats:
+    operation: str
+    statements: int = 0
+    commits: int = 0
+    db_time_s: float = 0.0
+    slow: int = 0
+    by_statement: Counter[str] = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [
+            (statement, count)
+            for statement, count in self.by_statement.most_common()
+            if count >= threshold and statement.lstrip().upper().startswith("SELECT")
+        ]
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+_explaining: ContextVar[bool] = ContextVar("sql_explaining", default=False)
+
+
+@contextmanager
+def track_queries(operation: str) -> Iterator[QueryStats]:
+    outer = current_query_stats.get()
+    if outer is not None:
+        yield outer
+        return
+    stats = QueryStats(operation)
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+def report(stats: QueryStats) -> None:
+    sql_statements.labels(operation=stats.operation).observe(stats.statements)
+    sql_duration.labels(operation=stats.operation).observe(stats.db_time_s)
+    sql_commits.labels(operation=stats.operation).inc(stats.commits)
+    for statement, count in stats.repeated(settings.sql_n_plus_one_threshold):
+        sql_repeated_statements.labels(operation=stats.operation).inc()
+        logger.warning(
+            "Repeated SQL statement, possible N+1",
+            extra={
+                "operation": stats.operation,
+                "count": count,
+                "statement": statement[:_MAX_LOGGED_STATEMENT],
+            },
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "commit", _on_commit)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _explaining.get():
+        return
+    elapsed = time.perf_counter() - context._query_started
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time_s += elapsed
+        stats.by_statement[statement] += 1
+    if elapsed * 1000 < settings.sql_slow_query_ms:
+        return
+    if stats is not None:
+        stats.slow += 1
+    logger.warning(
+        "Slow SQL statement",
+        extra={
+            "operation": stats.operation if stats is not None else None,
+            "duration_ms": round(elapsed * 1000, 3),
+            "statement": statement[:_MAX_LOGGED_STATEMENT],
+            "plan": _explain(conn, statement, parameters)
+            if settings.sql_explain_slow_queries and not executemany
+            else None,
+        },
+    )
+
+
+def _on_commit(conn) -> None:
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.commits += 1
+
+
+def _explain(conn, statement: str, parameters: Any) -> str | None:
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    # SAVEPOINT needs a transaction block, which AUTOCOMMIT connections never have.
+    autocommit = conn.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+    if autocommit or not conn.in_transaction():
+        return None
+    token = _explaining.set(True)
+    try:
+        conn.exec_driver_sql("SAVEPOINT sql_explain")
+        try:
+            rows = conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            ).fetchall()
+        except Exception:
+            conn.exec_driver_sql("ROLLBACK TO SAVEPOINT sql_explain")
+            raise
+        conn.exec_driver_sql("RELEASE SAVEPOINT sql_explain")
+        return "\n".join(row[0] for row in rows)
+    except Exception:
+        # Debug-only capture must never fail the statement that triggered it.
+        logger.warning("EXPLAIN of slow SQL statement failed", exc_info=True)
+        return None
+    finally:
+        _explaining.reset(token)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import ContextManager, Iterator
+
+from memory_mcp.metrics import stage_latency
+
+
+class StageTimer:
+    def __init__(self, operation: str) -> None:
+        self.operation = operation
+        self.timings: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stage_latency.labels(operation=self.operation, stage=name).observe(elapsed)
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def as_ms(self) -> dict[str, float]:
+        return {name: round(seconds * 1000, 3) for name, seconds in self.timings.items()}
+
+
+current_timer: ContextVar[StageTimer | None] = ContextVar("current_timer", default=None)
+
+
+@contextmanager
+def timed_operation(operation: str) -> Iterator[StageTimer]:
+    outer = current_timer.get()
+    if outer is not None:
+        yield outer
+        return
+    timer = StageTimer(operation)
+    token = current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        current_timer.reset(token)
+
+
+def stage(name: str) -> ContextManager[None]:
+    timer = current_timer.get()
+    if timer is None:
+        return nullcontext()
+    return timer.stage(name)
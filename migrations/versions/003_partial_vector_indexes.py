@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from alembic import op
+
+revision = "003_partial_vector_indexes"
+down_revision = "002_plan_jobs"
+branch_labels = None
+depends_on = None
+
+_RUNTIME_SUFFIXES = [
+    f"{method}{quantization}"
+    for method in ("hnsw", "ivfflat")
+    for quantization in ("", "_halfvec", "_binary")
+]
+
+
+def upgrade() -> None:
+    # The initial ivfflat indexes use the default L2 opclass and were trained on empty
+    # tables, so cosine queries never used them. Startup builds the tuned replacements.
+    # CONCURRENTLY avoids an ACCESS EXCLUSIVE lock on turns/memory_items but cannot run
+    # inside the migration transaction.
+    with op.get_context().autocommit_block():
+        for name in (
+            "ix_turns_embedding",
+            "ix_memory_embedding",
+            "ix_memory_embedding_hnsw",
+            "ix_memory_embedding_ivfflat",
+        ):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for suffix in _RUNTIME_SUFFIXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_memory_embedding_active_{suffix}")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_turns_embedding_{suffix}")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_memory_embedding "
+            "ON memory_items USING ivfflat (embedding)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_turns_embedding "
+            "ON turns USING ivfflat (embedding)"
+        )
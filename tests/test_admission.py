@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from memory_mcp.utils.admission import AdmissionController, AdmissionRejected
+
+
+@pytest.mark.asyncio
+async def test_rejects_once_queue_is_full():
+    admission = AdmissionController({"audit.check_consistency": 1}, {"audit.check_consistency": 1})
+    release = asyncio.Event()
+
+    async def call() -> None:
+        async with admission.slot("audit.check_consistency"):
+            await release.wait()
+
+    running = asyncio.create_task(call())
+    queued = asyncio.create_task(call())
+    await asyncio.sleep(0)
+    assert admission.stats() == {"audit.check_consistency": {"active": 1, "queued": 1}}
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with admission.slot("audit.check_consistency"):
+            pass
+    assert rejected.value.retry_after_s >= 1
+    release.set()
+    await asyncio.gather(running, queued)
+    assert admission.stats() == {"audit.check_consistency": {"active": 0, "queued": 0}}
+
+
+@pytest.mark.asyncio
+async def test_limits_are_per_tool():
+    admission = AdmissionController({"distill.extract": 1}, {"distill.extract": 0})
+    async with admission.slot("distill.extract"):
+        with pytest.raises(AdmissionRejected):
+            admission.check("distill.extract")
+        async with admission.slot("retrieve.context") as waited:
+            assert waited == 0.0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    admission = AdmissionController({"retrieve.context": 1}, {"retrieve.context": 2})
+    limiter = admission.limiter("retrieve.context")
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancelled_during_release_stays_cancelled():
+    admission = AdmissionController({"retrieve.context": 1}, {"retrieve.context": 2})
+    limiter = admission.limiter("retrieve.context")
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    limiter.release()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.active == 0
+    assert limiter.queued == 0
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from memory_mcp.bench.load import Sample, parse_mix, summarize
+from memory_mcp.bench.stats import percentile
+
+
+def test_parse_mix_defaults_weight_and_rejects_unknown_tools():
+    assert parse_mix("turn.ingest=3,retrieve.context") == {
+        "turn.ingest": 3.0,
+        "retrieve.context": 1.0,
+    }
+    with pytest.raises(ValueError):
+        parse_mix("plan.create=1")
+    with pytest.raises(ValueError):
+        parse_mix("turn.ingest=0")
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_summarize_groups_by_tool():
+    samples = [
+        Sample("retrieve.context", 0.010, 6, 200),
+        Sample("retrieve.context", 0.030, 8, 200),
+        Sample("distill.extract", 0.100, 20, 429),
+    ]
+    report = summarize(samples, elapsed_s=2.0)
+    assert report["overall"]["requests"] == 3
+    assert report["overall"]["errors"] == 1
+    assert report["overall"]["throughput_rps"] == 1.5
+    retrieve = report["tools"]["retrieve.context"]
+    assert retrieve["p50_ms"] == 10.0
+    assert retrieve["p99_ms"] == 30.0
+    assert retrieve["sql_statements_total"] == 14
+    assert report["tools"]["distill.extract"]["status_codes"] == {"429": 1}
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from memory_mcp.bench.recall import (
+    SweepRow,
+    format_table,
+    int_list,
+    perturb,
+    recall_at_k,
+    search_sql,
+    synthetic_corpus,
+)
+
+
+def test_recall_at_k_counts_overlap_with_exact_results():
+    assert recall_at_k([1, 2, 3, 4], [1, 2, 5, 6]) == 0.5
+    assert recall_at_k([], []) == 1.0
+
+
+def test_int_list_parses_comma_separated_grid():
+    assert int_list("10, 20,40,") == [10, 20, 40]
+
+
+def test_synthetic_corpus_is_deterministic():
+    corpus = synthetic_corpus(count=20, dim=8, clusters=3, spread=0.1, seed=7)
+    assert corpus.shape == (20, 8)
+    assert (corpus == synthetic_corpus(count=20, dim=8, clusters=3, spread=0.1, seed=7)).all()
+    assert perturb(corpus, 0.0, seed=7).tolist() == corpus.tolist()
+
+
+def test_format_table_aligns_rows():
+    rows = [
+        SweepRow("exact", "-", "seq scan", 1.0, 12.5, 20.0, 0.0, 0.0),
+        SweepRow("hnsw", "m=16 ef_construction=128", "ef_search=40", 0.9731, 1.2, 2.4, 3.5, 78.1),
+    ]
+    lines = format_table(rows, k=10).splitlines()
+    assert lines[0].split() == [
+        "index", "build", "search", "recall@10", "p50_ms", "p95_ms", "build_s", "size_mb"
+    ]
+    assert set(lines[1]) == {"-", " "}
+    assert "0.9731" in lines[3]
+    assert len({len(line.rstrip()) for line in lines[:2]}) == 1
+
+
+def test_quantized_search_reranks_a_larger_shortlist():
+    assert "IN (" not in search_sql("none", 8, 4)
+    halfvec = search_sql("halfvec", 8, 4)
+    assert "embedding::halfvec(8) <=> CAST(:query AS halfvec(8)) LIMIT 4 * :k" in halfvec
+    assert halfvec.endswith("ORDER BY embedding <=> CAST(:query AS vector) LIMIT :k")
+    assert "binary_quantize(embedding)::bit(8) <~>" in search_sql("binary", 8, 4)
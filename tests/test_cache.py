@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from prometheus_client import CollectorRegistry, generate_latest
+
+from memory_mcp.metrics import CacheCollector
+from memory_mcp.utils.cache import LRUCache
+
+
+def test_cache_packs_vectors_and_tracks_stats():
+    cache = LRUCache(max_entries=4, ttl_s=60)
+    cache.set("a", [0.5, 0.25])
+    assert cache.get("a") == [0.5, 0.25]
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["bytes"] > 0
+
+
+def test_cache_evicts_least_recently_used_by_entries_and_bytes():
+    cache = LRUCache(max_entries=2, ttl_s=60)
+    cache.set("a", [1.0])
+    cache.set("b", [2.0])
+    cache.get("a")
+    cache.set("c", [3.0])
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.evictions == 1
+
+    entry_bytes = cache.bytes_used // len(cache)
+    bounded = LRUCache(max_entries=100, ttl_s=60, max_bytes=entry_bytes * 2)
+    for key in ["x", "y", "z"]:
+        bounded.set(key, [1.0])
+    assert len(bounded) == 2
+    assert bounded.get("x") is None
+    assert bounded.bytes_used <= entry_bytes * 2
+
+
+def test_cache_expires_entries():
+    cache = LRUCache(max_entries=2, ttl_s=-1)
+    cache.set("a", "value")
+    assert cache.get("a") is None
+    assert cache.bytes_used == 0
+
+
+def test_cache_stats_are_exported():
+    cache = LRUCache(max_entries=1, ttl_s=60)
+    collector = CacheCollector()
+    registry = CollectorRegistry()
+    registry.register(collector)
+    collector.track("test", cache)
+    cache.set("a", [1.0])
+    cache.set("b", [2.0])
+    cache.get("b")
+    cache.get("a")
+    exported = generate_latest(registry).decode()
+    assert 'cache_hits_total{cache="test"} 1.0' in exported
+    assert 'cache_misses_total{cache="test"} 1.0' in exported
+    assert 'cache_evictions_total{cache="test"} 1.0' in exported
+    assert 'cache_entries{cache="test"} 1.0' in exported
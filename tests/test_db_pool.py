@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from sqlalchemy.exc import DisconnectionError
+
+from memory_mcp.db import _ping_if_idle
+
+
+class _Cursor:
+    def __init__(self, fail: bool) -> None:
+        self.fail = fail
+        self.executed: list[str] = []
+
+    def execute(self, statement: str) -> None:
+        self.executed.append(statement)
+        if self.fail:
+            raise OSError("connection reset")
+
+    def close(self) -> None:
+        return None
+
+
+class _Connection:
+    def __init__(self, fail: bool = False) -> None:
+        self.cursor_obj = _Cursor(fail)
+
+    def cursor(self) -> _Cursor:
+        return self.cursor_obj
+
+
+class _Record:
+    def __init__(self, checked_in_at: float | None) -> None:
+        self.info = {} if checked_in_at is None else {"checked_in_at": checked_in_at}
+
+
+def test_recently_used_connections_skip_the_ping():
+    connection = _Connection()
+    _ping_if_idle(connection, _Record(time.monotonic()), None)
+    _ping_if_idle(connection, _Record(None), None)
+    assert connection.cursor_obj.executed == []
+
+
+def test_idle_connections_are_pinged_and_invalidated_on_failure():
+    healthy = _Connection()
+    _ping_if_idle(healthy, _Record(time.monotonic() - 3600), None)
+    assert healthy.cursor_obj.executed == ["SELECT 1"]
+    with pytest.raises(DisconnectionError):
+        _ping_if_idle(_Connection(fail=True), _Record(time.monotonic() - 3600), None)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from memory_mcp.mcp_router import ToolSpec, stream_tool
+from memory_mcp.services.llm_client import LLMClient
+from memory_mcp.utils.deadline import DeadlineExceeded, bounded, remaining, use_deadline
+
+
+def test_nested_deadline_keeps_the_tighter_budget():
+    assert remaining() is None
+    with use_deadline(0.5):
+        with use_deadline(10.0):
+            assert remaining() <= 0.5
+        assert bounded(20.0) <= 0.5
+    assert remaining() is None
+    assert bounded(20.0) == 20.0
+
+
+@pytest.mark.asyncio
+async def test_llm_retries_stop_at_the_deadline():
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        return httpx.Response(503, json={})
+
+    client = LLMClient()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    started = time.monotonic()
+    with use_deadline(0.5):
+        with pytest.raises(DeadlineExceeded):
+            await client._post("/embeddings", {"input": ["a"]}, "embed", 1)
+    assert attempts == 1
+    assert time.monotonic() - started < 0.5
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_streamed_tool_stops_at_the_deadline(monkeypatch):
+    async def handler(session, payload):
+        return {}
+
+    async def slow_stream(session, payload):
+        yield {"event": "partial"}
+        await asyncio.sleep(1.0)
+        yield {"event": "done", "result": {}}
+
+    spec = ToolSpec("stub.stream", BaseModel, handler, True, False, "", slow_stream)
+    events = []
+    started = time.monotonic()
+    with use_deadline(0.05):
+        with pytest.raises(HTTPException) as caught:
+            async for event in stream_tool(None, spec, None):
+                events.append(event)
+    assert caught.value.status_code == 504
+    assert events == [{"event": "partial"}]
+    assert time.monotonic() - started < 0.5
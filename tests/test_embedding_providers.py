@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from memory_mcp.services.embedding_providers import EmbeddingProvider, HashingEmbeddingProvider
+
+
+@pytest.mark.asyncio
+async def test_hashing_provider_is_deterministic_and_normalized():
+    provider = HashingEmbeddingProvider(dim=64)
+    first, second, other = await provider.embed(
+        ["Use Postgres for storage", "use postgres for storage", "Deploy on Kubernetes"]
+    )
+    assert len(first) == 64
+    assert first == pytest.approx(second)
+    assert math.isclose(sum(value * value for value in first), 1.0, rel_tol=1e-5)
+    similarity = sum(a * b for a, b in zip(first, other))
+    assert similarity < 0.5
+
+
+def test_providers_must_implement_embed():
+    with pytest.raises(TypeError):
+        EmbeddingProvider()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from memory_mcp.utils.hedging import HedgePolicy, hedged_call
+
+
+def _warm_policy(max_rate: float) -> HedgePolicy:
+    policy = HedgePolicy(percentile=0.9, min_delay_s=0.01, max_rate=max_rate, window=50, min_samples=5)
+    for _ in range(5):
+        policy.record_latency(0.01)
+    return policy
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_when_primary_is_slow():
+    policy = _warm_policy(max_rate=1.0)
+    delays = [1.0, 0.0]
+
+    async def call() -> float:
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return delay
+
+    result = await asyncio.wait_for(hedged_call(call, policy), timeout=0.5)
+    assert result == 0.0
+
+
+@pytest.mark.asyncio
+async def test_hedge_rate_cap_waits_for_primary():
+    policy = _warm_policy(max_rate=0.0)
+    calls = 0
+
+    async def call() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert await hedged_call(call, policy) == "primary"
+    assert calls == 1
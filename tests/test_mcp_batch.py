@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from memory_mcp import mcp_router
+from memory_mcp.config import settings
+from memory_mcp.db import get_session
+from memory_mcp.mcp_router import TOOLS, BatchToolCall, ToolSpec, _run_batch
+
+
+class FakeSession:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.rollbacks = 0
+
+    async def __aenter__(self) -> FakeSession:
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+class EchoRequest(BaseModel):
+    value: int
+
+
+@pytest.fixture
+def stub_tools(monkeypatch):
+    log: list[tuple[str, str, int]] = []
+    in_flight = {"now": 0, "max": 0}
+    replica = FakeSession("replica")
+
+    async def read(session: FakeSession, payload: EchoRequest) -> dict[str, Any]:
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        log.append(("read", session.name, payload.value))
+        return {"value": payload.value}
+
+    async def write(session: FakeSession, payload: EchoRequest) -> dict[str, Any]:
+        log.append(("write", session.name, payload.value))
+        if payload.value == 404:
+            raise HTTPException(status_code=404, detail="Thread not found")
+        if payload.value < 0:
+            raise ValueError("write failed")
+        return {"value": payload.value}
+
+    monkeypatch.setitem(
+        TOOLS, "stub.read", ToolSpec("stub.read", EchoRequest, read, True, False, "")
+    )
+    monkeypatch.setitem(
+        TOOLS, "stub.write", ToolSpec("stub.write", EchoRequest, write, False, False, "")
+    )
+    monkeypatch.setattr(mcp_router, "read_session_factory", lambda: replica)
+    return log, in_flight
+
+
+def _calls(*items: tuple[str, dict[str, Any]]) -> list[BatchToolCall]:
+    return [
+        BatchToolCall(id=index, tool=name, arguments=args)
+        for index, (name, args) in enumerate(items)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_keeps_order_and_runs_reads_concurrently(stub_tools):
+    log, in_flight = stub_tools
+    session = FakeSession("request")
+    results = await _run_batch(
+        session,
+        _calls(
+            ("stub.read", {"value": 1}),
+            ("stub.read", {"value": 2}),
+            ("stub.read", {"value": 3}),
+            ("stub.write", {"value": 4}),
+            ("stub.read", {"value": 5}),
+        ),
+    )
+    assert [result["id"] for result in results] == [0, 1, 2, 3, 4]
+    assert [result["result"]["value"] for result in results] == [1, 2, 3, 4, 5]
+    assert in_flight["max"] == 3
+    assert log.index(("write", "request", 4)) == 3
+    assert {name for kind, name, _ in log if kind == "read"} == {"replica"}
+
+
+@pytest.mark.asyncio
+async def test_batch_writes_run_in_order_and_roll_back_failures(stub_tools):
+    log, _ = stub_tools
+    session = FakeSession("request")
+    results = await _run_batch(
+        session,
+        _calls(
+            ("stub.write", {"value": 1}),
+            ("stub.write", {"value": -1}),
+            ("stub.write", {"value": 2}),
+        ),
+    )
+    assert log == [("write", "request", 1), ("write", "request", -1), ("write", "request", 2)]
+    assert results[1] == {"id": 1, "error": {"code": -32000, "message": "write failed"}}
+    assert results[2] == {"id": 2, "result": {"value": 2}}
+    assert session.rollbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_unknown_tools_and_invalid_params(stub_tools):
+    results = await _run_batch(
+        FakeSession("request"),
+        _calls(
+            ("stub.missing", {}),
+            ("stub.write", {"value": "not a number"}),
+            ("stub.write", {"value": 404}),
+        ),
+    )
+    assert results[0]["error"]["code"] == -32601
+    assert results[1]["error"]["code"] == -32602
+    assert results[2]["error"] == {
+        "code": -32000,
+        "message": "Thread not found",
+        "data": {"status_code": 404},
+    }
+
+
+def test_batch_size_is_capped(stub_tools, monkeypatch):
+    monkeypatch.setattr(settings, "mcp_max_batch_size", 2)
+    app = FastAPI()
+    app.include_router(mcp_router.router, prefix="/mcp")
+    app.dependency_overrides[get_session] = lambda: FakeSession("request")
+    client = TestClient(app)
+    call = {"tool": "stub.write", "arguments": {"value": 1}}
+
+    assert client.post("/mcp", json=[call] * 3).status_code == 400
+    response = client.post("/mcp", json=[call] * 2)
+    assert response.status_code == 200
+    assert [item["result"] for item in response.json()] == [{"value": 1}] * 2
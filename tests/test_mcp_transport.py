@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from memory_mcp.mcp_router import ToolSpec
+from memory_mcp.mcp_transport import SESSION_HEADER, McpSession, _with_session_state, router
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/mcp/rpc")
+    return TestClient(app)
+
+
+def test_initialize_and_list_tools():
+    client = _client()
+    response = client.post(
+        "/mcp/rpc",
+        json={"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"protocolVersion": "2025-03-26"}},
+    )
+    assert response.json()["result"]["protocolVersion"] == "2025-03-26"
+    session_id = response.headers[SESSION_HEADER]
+
+    tools = client.post(
+        "/mcp/rpc",
+        json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+        headers={SESSION_HEADER: session_id},
+    ).json()["result"]["tools"]
+    by_name = {item["name"]: item for item in tools}
+    assert "thread_id" in by_name["retrieve.context"]["inputSchema"]["properties"]
+    assert by_name["retrieve.context"]["annotations"]["readOnlyHint"] is True
+
+    assert client.delete("/mcp/rpc", headers={SESSION_HEADER: session_id}).status_code == 204
+
+
+def test_requests_require_a_session():
+    client = _client()
+    missing = client.post("/mcp/rpc", json={"jsonrpc": "2.0", "id": 1, "method": "ping"})
+    assert missing.status_code == 400
+    expired = client.post(
+        "/mcp/rpc",
+        json={"jsonrpc": "2.0", "id": 1, "method": "ping"},
+        headers={SESSION_HEADER: "unknown"},
+    )
+    assert expired.status_code == 404
+
+
+def test_session_state_fills_only_required_fields():
+    class Payload(BaseModel):
+        thread_id: UUID
+        plan_id: UUID | None = None
+
+    spec = ToolSpec("stub.tool", Payload, None, False, False, "")
+    session = McpSession("id", "2025-03-26", {})
+    thread_id, plan_id = str(uuid4()), str(uuid4())
+    session.state.update({"thread_id": thread_id, "plan_id": plan_id})
+    assert _with_session_state(session, spec, {}) == {"thread_id": thread_id}
+    assert _with_session_state(session, spec, {"thread_id": "explicit"}) == {"thread_id": "explicit"}
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from memory_mcp.utils.priority import Priority, PriorityLimiter
+
+
+@pytest.mark.asyncio
+async def test_interactive_waiters_run_before_background():
+    lanes = PriorityLimiter(1, {Priority.interactive: 1, Priority.background: 1})
+    order: list[str] = []
+
+    async def call(name: str, priority: Priority) -> None:
+        async with lanes.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await lanes.acquire(Priority.background)
+    tasks = [
+        asyncio.create_task(call("bg-1", Priority.background)),
+        asyncio.create_task(call("bg-2", Priority.background)),
+        asyncio.create_task(call("ui-1", Priority.interactive)),
+    ]
+    await asyncio.sleep(0)
+    lanes.release(Priority.background)
+    await asyncio.gather(*tasks)
+    assert order == ["ui-1", "bg-1", "bg-2"]
+
+
+@pytest.mark.asyncio
+async def test_background_lane_budget_leaves_room_for_interactive():
+    lanes = PriorityLimiter(3, {Priority.interactive: 3, Priority.background: 2})
+    await lanes.acquire(Priority.background)
+    await lanes.acquire(Priority.background)
+    blocked = asyncio.create_task(lanes.acquire(Priority.background))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+    await asyncio.wait_for(lanes.acquire(Priority.interactive), timeout=1)
+    blocked.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await blocked
+    assert lanes.active == {Priority.interactive: 1, Priority.background: 2}
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancelled_during_release_stays_cancelled():
+    lanes = PriorityLimiter(1, {Priority.interactive: 1, Priority.background: 1})
+    await lanes.acquire(Priority.background)
+    waiter = asyncio.create_task(lanes.acquire(Priority.background))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    lanes.release(Priority.background)
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert lanes.active == {Priority.interactive: 0, Priority.background: 0}
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from memory_mcp import profiling
+from memory_mcp.config import settings
+from memory_mcp.profiling import LoopLagMonitor, collapse, sample_threads
+
+
+def test_collapse_emits_one_line_per_stack():
+    samples = Counter({("thread main", "a", "b"): 3, ("thread main", "a"): 1, (): 2})
+    assert collapse(samples) == "thread main;a;b 3\nthread main;a 1\n"
+
+
+def test_sample_threads_sees_other_threads():
+    stop = threading.Event()
+
+    def busy_worker() -> None:
+        while not stop.is_set():
+            time.sleep(0.001)
+
+    worker = threading.Thread(target=busy_worker, name="busy")
+    worker.start()
+    try:
+        samples = sample_threads(0.05, 0.005)
+    finally:
+        stop.set()
+        worker.join()
+    stacks = [stack for stack in samples if stack[0] == "thread busy"]
+    assert stacks
+    assert any("busy_worker" in frame for stack in stacks for frame in stack)
+
+
+def test_loop_lag_monitor_counts_spikes():
+    monitor = LoopLagMonitor(threshold_s=0.1, interval_s=0.5)
+    monitor.observe(0.01)
+    monitor.observe(0.25)
+    monitor.observe(0.05)
+    stats = monitor.stats()
+    assert stats["spikes"] == 1
+    assert stats["max_lag_ms"] == 250.0
+    assert stats["last_lag_ms"] == 50.0
+
+
+def test_debug_endpoints_require_admin_token(monkeypatch):
+    app = FastAPI()
+    app.include_router(profiling.router, prefix="/debug")
+    client = TestClient(app)
+
+    monkeypatch.setattr(settings, "admin_token", "")
+    assert client.get("/debug/loop-lag").status_code == 404
+
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    assert client.get("/debug/loop-lag").status_code == 403
+    assert client.get("/debug/loop-lag", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    headers = {"X-Admin-Token": "secret"}
+    assert client.get("/debug/loop-lag", headers=headers).json()["spikes"] >= 0
+    assert client.get("/debug/tasks", headers=headers).json()["count"] >= 1
+    response = client.get(
+        "/debug/profile", params={"seconds": 0.05, "mode": "tasks"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
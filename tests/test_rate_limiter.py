@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from memory_mcp.services.llm_client import LLMClient
+from memory_mcp.utils.deadline import DeadlineExceeded, use_deadline
+from memory_mcp.utils.priority import Priority, use_priority
+from memory_mcp.utils.rate_limiter import RateLimiter, parse_reset_duration
+
+
+def test_parse_reset_duration():
+    assert parse_reset_duration("1s") == 1.0
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert parse_reset_duration("2") == 2.0
+    assert parse_reset_duration(None) is None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_queues_when_exhausted():
+    limiter = RateLimiter(rpm=600, tpm=0)
+    limiter.requests.level = 1
+    assert await limiter.acquire(10) == 0.0
+    start = time.monotonic()
+    await limiter.acquire(10)
+    assert time.monotonic() - start >= 0.09
+
+
+def test_headers_learn_limits_and_block_on_reset():
+    limiter = RateLimiter(rpm=0, tpm=0)
+    limiter.update_from_headers(
+        {
+            "x-ratelimit-limit-tokens": "60000",
+            "x-ratelimit-remaining-tokens": "0",
+            "x-ratelimit-reset-tokens": "2s",
+        }
+    )
+    assert limiter.requests is None
+    assert limiter.tokens is not None
+    assert limiter.tokens.capacity == 60000
+    assert limiter.blocked_until - time.monotonic() > 1.5
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_wait_stops_at_the_deadline():
+    limiter = RateLimiter(rpm=0, tpm=0)
+    limiter.backoff(5.0)
+    start = time.monotonic()
+    with use_deadline(0.05):
+        with pytest.raises(DeadlineExceeded):
+            await limiter.acquire(10)
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_waiters_do_not_serialize():
+    limiter = RateLimiter(rpm=0, tpm=0)
+    limiter.backoff(0.1)
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire(1) for _ in range(3)))
+    assert time.monotonic() - start < 0.25
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_call_does_not_hold_a_lane_slot():
+    client = LLMClient()
+    client._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"data": [{"embedding": [0.5]}]}))
+    )
+    client._rate_limiters["embed"].backoff(0.1)
+    with use_priority(Priority.background):
+        waiting = asyncio.create_task(client._embed_remote(["text"]))
+    await asyncio.sleep(0.02)
+    assert not waiting.done()
+    assert client._lanes.active == {Priority.interactive: 0, Priority.background: 0}
+    assert await waiting == [[0.5]]
+    await client.close()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from memory_mcp.logging import RequestIdFilter
+from memory_mcp.utils.request_context import (
+    current_request_id,
+    record_cache,
+    record_llm,
+    track_call,
+    use_request_id,
+)
+
+
+def _record() -> logging.LogRecord:
+    return logging.LogRecord("memory_mcp", logging.INFO, __file__, 1, "msg", None, None)
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_shared_by_tasks_and_log_records():
+    with use_request_id("req-1"):
+        ids = await asyncio.gather(*[asyncio.to_thread(current_request_id.get) for _ in range(2)])
+        record = _record()
+        RequestIdFilter().filter(record)
+    assert ids == ["req-1", "req-1"]
+    assert record.request_id == "req-1"
+    assert current_request_id.get() is None
+
+
+def test_call_metrics_accumulate_inside_a_call():
+    record_llm(1.0, 100)
+    with track_call() as call:
+        record_llm(0.25, 40)
+        record_cache(hits=3, misses=1)
+        with track_call() as nested:
+            record_llm(0.25, 10)
+        assert nested is call
+    assert (call.llm_calls, call.llm_time_s, call.tokens) == (2, 0.5, 50)
+    assert (call.cache_hits, call.cache_misses) == (3, 1)
@@ -47,4 +47,7 @@ async def test_retrieval_explain_and_stale(db_session):
         explain=True,
     )
     assert result["stale_references"]
+    assert {"embed", "memory_vector", "memory_keyword", "stale_refs"} <= set(
+        result["debug_scores"]["stages_ms"]
+    )
     await llm.close()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from memory_mcp.schemas import MemoryType, RetrievalMode, RetrievalScope
+from memory_mcp.services.llm_client import LLMClient
+from memory_mcp.services.memory_items import upsert_memory_item
+from memory_mcp.services.plans import create_plan
+from memory_mcp.services.retrieval import stream_retrieve_context
+from memory_mcp.services.turns import create_thread, ingest_turn
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_memory_before_turns(db_session):
+    plan = await create_plan(db_session, "plan", {})
+    thread = await create_thread(db_session, plan.id, {})
+    llm = LLMClient()
+
+    payload = {
+        "title": "Storage",
+        "statement": "Use Postgres for storage",
+        "importance": 0.7,
+        "confidence": 0.7,
+        "severity": 0.0,
+        "tags": [],
+        "affects": [],
+        "code_refs": [],
+    }
+    await upsert_memory_item(db_session, llm, thread.id, MemoryType.decision, payload, [])
+    await ingest_turn(
+        db_session, llm, thread.id, "user", "Postgres storage it is", None, {}, None, None, False
+    )
+
+    events = [
+        event
+        async for event in stream_retrieve_context(
+            db_session,
+            llm,
+            thread.id,
+            "Postgres storage",
+            RetrievalMode.deep,
+            RetrievalScope.hybrid,
+            top_k=5,
+            token_budget=400,
+            recency_bias=0.1,
+            explain=False,
+        )
+    ]
+    assert [event.get("source") for event in events[:2]] == ["memory", "turn"]
+    assert events[-1]["event"] == "done"
+    result = events[-1]["result"]
+    assert result["est_tokens"] <= 400
+    assert len(result["chunks"]) == len(events[0]["chunks"]) + len(events[1]["chunks"])
+    await llm.close()
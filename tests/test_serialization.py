@@ -0,0 +1,19 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from memory_mcp.schemas import DistillItem, DistillResult
+from memory_mcp.utils.serialization import dumps
+
+
+def test_dumps_matches_jsonable_encoder():
+    payload = {
+        "id": uuid.uuid4(),
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "ranks": (1, None, 3),
+        "extracted": DistillResult(decisions=[DistillItem(title="T", statement="S", importance=0.5, confidence=0.5)]),
+        "scores": [0.5, 0.25],
+    }
+    assert json.loads(dumps(payload)) == json.loads(json.dumps(jsonable_encoder(payload)))
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from memory_mcp.config import settings
+from memory_mcp.services.llm_client import LLMClient
+from memory_mcp.utils.deadline import DeadlineExceeded
+from memory_mcp.utils.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_flight():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*[flight.do("key", fetch) for _ in range(5)])
+    assert results == ["value"] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_failure_propagates_to_waiters_and_clears_key():
+    flight = SingleFlight()
+    owned, _ = flight.claim(["a", "b"])
+    _, waiting = flight.claim(["a"])
+    flight.resolve(owned, "b", 1)
+    flight.fail(owned, ValueError("boom"))
+    with pytest.raises(ValueError):
+        await waiting["a"]
+    assert await owned["b"] == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_embed_waiters_see_the_leader_error(monkeypatch):
+    monkeypatch.setattr(settings, "fake_llm", False)
+    client = LLMClient()
+    started = asyncio.Event()
+
+    async def fail(texts: list[str]) -> list[list[float]]:
+        started.set()
+        await asyncio.sleep(0.01)
+        raise DeadlineExceeded("Deadline exceeded during embedding")
+
+    monkeypatch.setattr(client, "_embed_remote", fail)
+    leader = asyncio.create_task(client.embed(["a"]))
+    await started.wait()
+    results = await asyncio.gather(leader, client.embed(["a"]), return_exceptions=True)
+    assert all(isinstance(result, DeadlineExceeded) for result in results)
+    assert len(client._embed_flight) == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_embed_short_response_fails_missing_keys(monkeypatch):
+    monkeypatch.setattr(settings, "fake_llm", False)
+    client = LLMClient()
+
+    async def short(texts: list[str]) -> list[list[float]]:
+        return [[0.0]]
+
+    monkeypatch.setattr(client, "_embed_remote", short)
+    with pytest.raises(RuntimeError, match="Embedding missing"):
+        await client.embed(["a", "b"])
+    assert len(client._embed_flight) == 0
+    await client.close()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, event, text
+
+from memory_mcp.config import settings
+from memory_mcp.utils.sql_stats import instrument_engine, track_queries
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    return engine
+
+
+def test_counts_statements_and_commits_per_operation():
+    engine = _engine()
+    with track_queries("turn.ingest") as stats:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+            conn.execute(text("SELECT id FROM t"))
+    assert stats.statements == 3
+    assert stats.commits == 1
+    assert stats.db_time_s > 0
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert stats.statements == 3
+
+
+def test_flags_repeated_selects():
+    engine = _engine()
+    with track_queries("retrieve.decision_state") as stats:
+        with engine.connect() as conn:
+            for item_id in range(settings.sql_n_plus_one_threshold):
+                conn.execute(text("SELECT :id"), {"id": item_id})
+            conn.execute(text("SELECT 2"))
+    assert stats.repeated(settings.sql_n_plus_one_threshold) == [
+        ("SELECT ?", settings.sql_n_plus_one_threshold)
+    ]
+
+
+def test_slow_query_explain_never_fails_the_statement(monkeypatch):
+    monkeypatch.setattr(settings, "sql_slow_query_ms", 0)
+    monkeypatch.setattr(settings, "sql_explain_slow_queries", True)
+    engine = _engine()
+    executed: list[str] = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: executed.append(statement),
+    )
+    with engine.connect() as conn:
+        autocommit = conn.execution_options(isolation_level="AUTOCOMMIT")
+        assert autocommit.execute(text("SELECT 1")).scalar_one() == 1
+    assert executed == ["SELECT 1"]
+    with engine.begin() as conn:
+        # SQLite rejects the EXPLAIN options, so the capture itself fails.
+        assert conn.execute(text("SELECT 2")).scalar_one() == 2
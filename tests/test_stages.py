@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from memory_mcp.utils.stages import current_timer, stage, timed_operation
+
+
+def test_stages_accumulate_into_the_outer_operation():
+    with timed_operation("distill.extract") as timer:
+        with stage("llm_extract"):
+            pass
+        with timed_operation("memory.upsert") as nested:
+            assert nested is timer
+            with stage("dedup_vector"):
+                pass
+            with stage("dedup_vector"):
+                pass
+    assert current_timer.get() is None
+    assert set(timer.as_ms()) == {"llm_extract", "dedup_vector"}
+    assert all(value >= 0 for value in timer.as_ms().values())
+
+
+def test_stage_without_operation_is_a_no_op():
+    with stage("embed"):
+        pass
+    assert current_timer.get() is None
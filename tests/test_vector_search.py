@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from memory_mcp.config import settings
+from memory_mcp.models import MemoryItem
+from memory_mcp.schemas import RetrievalMode
+from memory_mcp.services import vector_index
+from memory_mcp.services.vector_index import (
+    active_filter,
+    distance_order,
+    hot_thread_index_name,
+    index_specs,
+    index_target,
+    nearest,
+    parse_version,
+    progress_ratio,
+    search_settings,
+    thread_filter,
+)
+
+
+def test_parse_version_handles_suffixes():
+    assert parse_version("0.8.0") == (0, 8, 0)
+    assert parse_version("0.7.4-dev") == (0, 7, 4)
+    assert parse_version("0") == (0,)
+
+
+def test_search_settings_follow_mode():
+    fast = search_settings(RetrievalMode.fast, (0, 7, 4))
+    deep = search_settings(RetrievalMode.deep, (0, 7, 4))
+    assert fast["hnsw.ef_search"] == str(settings.vector_hnsw_ef_search["fast"])
+    assert deep["ivfflat.probes"] == str(settings.vector_ivfflat_probes["deep"])
+    assert "hnsw.iterative_scan" not in fast
+
+
+def test_iterative_scan_needs_pgvector_0_8(monkeypatch):
+    monkeypatch.setattr(settings, "vector_iterative_scan", "strict_order")
+    values = search_settings(RetrievalMode.deep, (0, 8, 0))
+    assert values["hnsw.iterative_scan"] == "strict_order"
+    assert values["ivfflat.iterative_scan"] == "relaxed_order"
+
+    monkeypatch.setattr(settings, "vector_iterative_scan", "off")
+    values = search_settings(RetrievalMode.deep, (0, 8, 1))
+    assert values["ivfflat.iterative_scan"] == "off"
+
+
+def test_exact_order_hides_distance_operator_from_index():
+    distance = MemoryItem.embedding.cosine_distance([0.0] * settings.embedding_dim)
+    dialect = postgresql.dialect()
+    indexed = str(distance_order(distance, False).compile(dialect=dialect))
+    exact = str(distance_order(distance, True).compile(dialect=dialect))
+    assert indexed == "memory_items.embedding <=> %(embedding_1)s"
+    assert exact == f"({indexed}) + %(param_1)s"
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+def test_active_filter_is_literal_for_partial_index_matching():
+    assert _sql(active_filter(MemoryItem)) == "memory_items.status = 'active'"
+
+
+def test_thread_filter_inlines_hot_threads_only(monkeypatch):
+    hot, cold = uuid.uuid4(), uuid.uuid4()
+    monkeypatch.setattr(vector_index, "_hot_threads", {hot})
+    assert _sql(thread_filter(MemoryItem, hot)) == f"memory_items.thread_id = '{hot}'::uuid"
+    assert _sql(thread_filter(MemoryItem, cold)) == "memory_items.thread_id = %(thread_id_1)s::UUID"
+    assert len(hot_thread_index_name(hot, "ivfflat_halfvec")) <= 63
+
+
+def test_quantized_nearest_reranks_with_full_vectors(monkeypatch):
+    vector = [0.0] * settings.embedding_dim
+    filters = [active_filter(MemoryItem)]
+    monkeypatch.setattr(settings, "vector_quantization", "none")
+    assert "IN (" not in _sql(nearest(MemoryItem, vector, filters, 5, exact=False))
+
+    monkeypatch.setattr(settings, "vector_quantization", "halfvec")
+    sql = _sql(nearest(MemoryItem, vector, filters, 5, exact=False))
+    dim = settings.embedding_dim
+    assert f"CAST(memory_items.embedding AS HALFVEC({dim})) <=>" in sql
+    assert "memory_items.id IN (SELECT memory_items.id" in sql
+    assert "ORDER BY (memory_items.embedding <=> %(embedding_1)s) +" in sql
+
+    monkeypatch.setattr(settings, "vector_quantization", "binary")
+    sql = _sql(nearest(MemoryItem, vector, filters, 5, exact=False))
+    assert f"CAST(binary_quantize(memory_items.embedding) AS BIT({dim})) <~>" in sql
+    assert "halfvec_cosine_ops" in index_target("halfvec", dim)
+
+
+def test_progress_ratio_follows_build_phases():
+    building = "building index: loading tuples"
+    assert progress_ratio("waiting for writers before build", 0, 0, 0, 0) == 0.0
+    assert progress_ratio("building index: scanning table", 200, 50, 0, 0) == pytest.approx(0.1125)
+    assert progress_ratio(building, 200, 200, 1000, 0) == pytest.approx(0.45)
+    assert progress_ratio(building, 200, 200, 1000, 500) == pytest.approx(0.675)
+    assert progress_ratio(building, 0, 0, 10, 4) == pytest.approx(0.36)
+    assert progress_ratio(building, 200, 200, 1000, 1000) < 1.0
+    assert progress_ratio("index validation: scanning table", 200, 10, 0, 0) == 0.9
+
+
+def test_index_specs_cover_turns_active_and_hot_threads(monkeypatch):
+    hot = uuid.uuid4()
+    monkeypatch.setattr(settings, "vector_quantization", "halfvec")
+    specs = index_specs("hnsw", "(embedding vector_cosine_ops)", "m = 16", {hot})
+    assert [spec.name for spec in specs] == [
+        "ix_turns_embedding_hnsw_halfvec",
+        "ix_memory_embedding_active_hnsw_halfvec",
+        f"ix_mem_thread_hnsw_halfvec_{hot.hex}",
+    ]
+    assert specs[0].table == "turns" and "WHERE" not in specs[0].definition
+    assert specs[1].definition.endswith("WHERE status = 'active'")
+    assert specs[2].definition.endswith(f"AND thread_id = '{hot}'")
+
+    monkeypatch.setattr(settings, "vector_quantization", "none")
+    current = index_specs("hnsw", "(embedding vector_cosine_ops)", "m = 16", {hot})
+    names = {spec.name for spec in current}
+    assert names.isdisjoint(spec.name for spec in specs)
+    assert hot_thread_index_name(hot, "hnsw") in names
+
+
+def test_vector_index_status_tool_is_registered():
+    from memory_mcp.mcp_router import TOOLS
+
+    assert "vector_index.status" in TOOLS
+
+
+class _FakeResult:
+    def scalar_one(self):
+        return True
+
+    def scalar_one_or_none(self):
+        return None
+
+
+class _FakeConn:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def execution_options(self, **options):
+        return self
+
+    async def execute(self, statement, params=None):
+        await asyncio.sleep(0)
+        self.statements.append(str(statement))
+        return _FakeResult()
+
+
+class _FakeEngine:
+    def __init__(self) -> None:
+        self.conn = _FakeConn()
+
+    def connect(self):
+        return self.conn
+
+
+@pytest.mark.asyncio
+async def test_stale_index_survives_a_failed_replacement(monkeypatch):
+    old = {"ix_turns_embedding_hnsw", "ix_memory_embedding_active_hnsw"}
+
+    async def build(engine, conn, spec):
+        return spec.slot == "turns"
+
+    async def managed(conn):
+        return set(old)
+
+    async def nothing(conn):
+        return set()
+
+    monkeypatch.setattr(settings, "vector_index_type", "hnsw")
+    monkeypatch.setattr(settings, "vector_quantization", "halfvec")
+    monkeypatch.setattr(vector_index, "_build_index", build)
+    monkeypatch.setattr(vector_index, "_managed_indexes", managed)
+    monkeypatch.setattr(vector_index, "_hot_threads_wanted", nothing)
+    monkeypatch.setattr(vector_index, "_load_hot_threads", nothing)
+    engine = _FakeEngine()
+    await vector_index.ensure_vector_indexes(engine)
+    drops = [sql for sql in engine.conn.statements if sql.startswith("DROP INDEX")]
+    assert drops == ["DROP INDEX CONCURRENTLY IF EXISTS ix_turns_embedding_hnsw"]
+
+
+@pytest.mark.asyncio
+async def test_progress_watcher_finishes_before_the_outcome_is_recorded(monkeypatch):
+    from memory_mcp.metrics import vector_index_build_progress
+
+    async def watch(engine, name, pid):
+        try:
+            await asyncio.sleep(10)
+        finally:
+            await asyncio.sleep(0)
+            vector_index_build_progress.labels(index=name).set(0.5)
+
+    monkeypatch.setattr(vector_index, "_watch_progress", watch)
+    spec = vector_index.IndexSpec("ix_test_watcher", "turns", "USING hnsw (embedding)", "turns")
+    engine = _FakeEngine()
+    assert await vector_index._build_index(engine, engine.conn, spec)
+    await asyncio.sleep(0.01)
+    assert vector_index_build_progress.labels(index=spec.name)._value.get() == 1.0